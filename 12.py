@@ -1,15 +1,22 @@
 import streamlit as st
 import os
-import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.ensemble import RandomForestClassifier
-import tensorflow as tf
-from tensorflow.keras import layers, models
-import io
-import soundfile as sf
-import base64
-from scipy.fft import fft
-from scipy.signal import spectrogram
+from lazy_imports import lazy_module
+import opinion_store
+import instrumentation
+import admin_panel
+
+# 무거운 모듈(tensorflow, scipy, sklearn 등)은 '딥페이크 음성' 페이지에서 처음 사용할 때 불러옵니다
+np = lazy_module("numpy")
+tf = lazy_module("tensorflow")
+layers = lazy_module("tensorflow.keras.layers")
+models = lazy_module("tensorflow.keras.models")
+audio_features = lazy_module("audio_features")
+train_cnn = lazy_module("train_cnn")
+audio_player = lazy_module("audio_player")
+ingest = lazy_module("ingest")
+spectrogram_image = lazy_module("spectrogram_image")
+inference_pool = lazy_module("inference_pool")
+session_store = lazy_module("session_store")
 
 # 페이지 설정
 st.set_page_config(layout='wide', page_title='EthicApp')
@@ -20,54 +27,6 @@ menu = st.sidebar.radio("Menu", ["홈", "AI 윤리 개요", "딥페이크 음성
 # YouTube 영상 링크
 url = 'https://www.youtube.com/watch?v=XyEOEBsa8I4'
 
-# 합성 오디오 생성 함수
-def generate_synthetic_audio(is_real=True, duration=3, sr=22050):
-    t = np.linspace(0, duration, int(sr * duration))
-    if is_real:
-        # 자연스러운 주파수를 가진 진짜 음성 모사
-        freq = 200 + 100 * np.sin(2 * np.pi * 0.1 * t)
-        audio = 0.5 * np.sin(2 * np.pi * freq * t)
-    else:
-        # 인위적 패턴과 노이즈를 더한 딥페이크 음성 모사
-        freq = 200 + 50 * np.sin(2 * np.pi * 0.2 * t)
-        audio = 0.5 * np.sin(2 * np.pi * freq * t) + 0.1 * np.random.randn(len(t))
-    return audio, sr
-
-# MFCC 특성 추출 함수 (scipy + numpy 사용)
-def extract_mfcc(audio, sr, n_mfcc=13, n_fft=2048, hop_length=512, n_mels=40):
-    # 음성에서 퓨리에 변환 수행
-    freqs, times, Sxx = spectrogram(audio, fs=sr, nperseg=n_fft, noverlap=hop_length)
-    
-    # Mel 필터 뱅크 생성 (MFCC에서 사용하는 Mel 축을 변환)
-    mel_filters = np.zeros((n_mels, len(freqs)))
-    mel_freqs = np.linspace(0, sr / 2, n_mels + 2)
-    for i in range(1, len(mel_freqs) - 1):
-        start = int(np.floor(mel_freqs[i - 1] / (sr / 2) * len(freqs)))
-        end = int(np.floor(mel_freqs[i] / (sr / 2) * len(freqs)))
-        mel_filters[i - 1, start:end] = np.linspace(0, 1, end - start)
-    
-    # Mel 스펙트로그램 계산
-    mel_spectrogram = np.dot(mel_filters, np.abs(Sxx))
-    mel_log = np.log(mel_spectrogram + 1e-9)
-    
-    # MFCC 계산 (DCT 사용)
-    mfcc = np.fft.dct(mel_log, type=2, axis=0)[:n_mfcc]
-    return np.mean(mfcc.T, axis=0)
-
-# 스펙트로그램 이미지 추출 함수
-def extract_spectrogram(audio, sr, n_mels=128, hop_length=512):
-    _, _, Sxx = spectrogram(audio, fs=sr, nperseg=2048, noverlap=hop_length)
-    S_dB = 10 * np.log10(Sxx)
-    return S_dB
-
-# 오디오 재생 플레이어 생성 함수
-def get_audio_player(audio, sr):
-    buffer = io.BytesIO()
-    sf.write(buffer, audio, sr, format='WAV')
-    audio_base64 = base64.b64encode(buffer.getvalue()).decode()
-    audio_html = f'<audio controls><source src="data:audio/wav;base64,{audio_base64}" type="audio/wav"></audio>'
-    return audio_html
-
 # 간단한 CNN 모델 구성
 def build_cnn_model(input_shape=(128, 128, 1)):
     model = models.Sequential([
@@ -108,68 +67,74 @@ def run_deepfake_detection():
 
     with col1:
         if st.button("진짜 음성 생성"):
-            audio, sr = generate_synthetic_audio(is_real=True)
-            st.session_state['audio'] = audio
+            audio, sr = audio_features.generate_synthetic_audio(is_real=True)
+            session_store.put_audio(audio, sr)
             st.session_state['sr'] = sr
             st.session_state['is_real'] = True
             st.markdown("**✔️ 진짜 음성 샘플 생성됨**")
-            st.markdown(get_audio_player(audio, sr), unsafe_allow_html=True)
+            audio_player.show_audio_player(audio, sr)
 
     with col2:
         if st.button("가짜 음성 생성"):
-            audio, sr = generate_synthetic_audio(is_real=False)
-            st.session_state['audio'] = audio
+            audio, sr = audio_features.generate_synthetic_audio(is_real=False)
+            session_store.put_audio(audio, sr)
             st.session_state['sr'] = sr
             st.session_state['is_real'] = False
             st.markdown("**✔️ 가짜 음성 샘플 생성됨**")
-            st.markdown(get_audio_player(audio, sr), unsafe_allow_html=True)
+            audio_player.show_audio_player(audio, sr)
 
     uploaded_file = st.file_uploader("또는 WAV 파일 업로드", type=["wav"])
     if uploaded_file:
         try:
-            audio, sr = sf.read(uploaded_file)
-            st.session_state['audio'] = audio
+            audio, sr = ingest.load_audio(uploaded_file)
+            session_store.put_audio(audio, sr)
             st.session_state['sr'] = sr
             st.session_state['is_real'] = None
             st.markdown("**✔️ 업로드된 음성**")
-            st.markdown(get_audio_player(audio, sr), unsafe_allow_html=True)
+            audio_player.show_audio_player(audio, sr)
         except Exception as e:
             st.error(f"파일을 로드하는 데 실패했습니다: {e}")
 
+    # 음성 배열은 세션 저장소에 있음 (메모리 예산을 넘으면 오래 사용하지 않은 세션부터 정리됨)
+    audio, sr = session_store.get_audio()
+    if audio is None and 'sr' in st.session_state:
+        st.info("메모리를 아끼기 위해 오래 사용하지 않은 음성을 정리했습니다. 음성을 다시 생성하거나 업로드해주세요.")
+        del st.session_state['sr']
+
     # 2단계: 스펙트로그램 시각화
-    if 'audio' in st.session_state:
+    if audio is not None:
         st.subheader("2단계: 스펙트로그램 확인")
-        fig, ax = plt.subplots()
-        S_dB = extract_spectrogram(st.session_state['audio'], st.session_state['sr'])
-        ax.imshow(S_dB, aspect='auto', cmap='inferno', origin='lower')
-        ax.set(title='Mel 스펙트로그램')
-        st.pyplot(fig)
+        try:
+            S_dB = audio_features.extract_spectrogram(audio, sr)
+            st.image(spectrogram_image.render_spectrogram(S_dB),
+                     caption="Mel 스펙트로그램 (가로: 시간, 세로: 주파수, 아래쪽이 낮은 소리)", width='stretch')
+        except Exception as e:
+            st.error(f"스펙트로그램을 그리는 데 실패했습니다: {e}")
 
     # 3단계: AI 학습 및 분류
     st.subheader("3단계: AI로 분류하기")
     if st.button("학습 후 분류 실행"):
-        # 랜덤 포레스트용 데이터 생성
-        X_rf, y_rf = [], []
-        for _ in range(50):
-            ra, sr = generate_synthetic_audio(is_real=True)
-            fa, _ = generate_synthetic_audio(is_real=False)
-            X_rf.append(extract_mfcc(ra, sr))
-            X_rf.append(extract_mfcc(fa, sr))
-            y_rf.append(1)
-            y_rf.append(0)
-
-        X_rf = np.array(X_rf)
-        y_rf = np.array(y_rf)
-
-        # 랜덤 포레스트 모델 훈련
-        rf_model = RandomForestClassifier(n_estimators=100)
-        rf_model.fit(X_rf, y_rf)
-
-        # 음성 데이터 처리
-        mfcc = extract_mfcc(st.session_state['audio'], st.session_state['sr'])
-        pred_rf = rf_model.predict([mfcc])
-
-        st.write(f"랜덤 포레스트 예측: {'진짜' if pred_rf[0] == 1 else '가짜'} 음성")
+        if audio is None:
+            st.warning("먼저 음성을 생성하거나 업로드해주세요.")
+            return
+
+        # 특성 추출과 분류는 별도 작업자 프로세스에서 실행 (voice.py와 같은 작업자 풀)
+        with st.spinner("AI 모델 준비 중..."):
+            pool = inference_pool.get_inference_pool()
+        with instrumentation.span("rf_predict"), st.spinner("AI가 분류하는 중..."):
+            try:
+                prob_real = pool.submit_audio(audio, sr).result()
+            except Exception as e:
+                st.error(f"분류하는 데 실패했습니다. 다시 시도해주세요: {e}")
+                return
+
+        st.write(f"랜덤 포레스트 예측: {'진짜' if prob_real >= 0.5 else '가짜'} 음성")
+
+        # train_cnn.py로 미리 학습해 둔 CNN이 있으면 함께 표시
+        with instrumentation.span("cnn_predict"):
+            prob_cnn = train_cnn.predict_cnn(audio, sr)
+        if prob_cnn is not None:
+            st.write(f"CNN 예측: {'진짜' if prob_cnn >= 0.5 else '가짜'} 음성 (진짜일 확률 {prob_cnn:.0%})")
 
 # 메뉴 처리
 if menu == "홈":
@@ -190,8 +155,7 @@ if menu == "홈":
         user_opinion = st.text_area("여러분의 의견을 남겨주세요:")
         if st.button("제출"):
             if user_opinion:
-                with open("data.txt", "a") as file:
-                    file.write(f"{user_opinion}\n")
+                opinion_store.add_opinion(user_opinion, source="12.py")
                 st.success("의견이 성공적으로 제출되었습니다.")
             else:
                 st.warning("의견을 입력해주세요.")
@@ -210,3 +174,8 @@ elif menu == "딥페이크 음성":
     run_deepfake_detection()
 elif menu == "참고 자료":
     st.write("참고 자료 섹션입니다. 관련 문서 및 링크를 제공합니다.")
+
+# 관리자 패널 (ETHIC_ADMIN=1일 때만 표시, 이번 실행에서 계측한 단계까지 포함하도록 마지막에 그림)
+instrumentation.start_http_server()
+admin_panel.show_metrics_panel()
+admin_panel.show_memory_panel()
@@ -0,0 +1,131 @@
+# 관리자용 사이드바 패널 (ETHIC_ADMIN=1일 때만 표시)
+import os
+
+import streamlit as st
+
+import instrumentation
+import lazy_imports
+
+# 관리자 패널 표시 여부 (환경 변수로 변경 가능, 학생 화면에는 보이지 않음)
+ADMIN = os.environ.get("ETHIC_ADMIN", "0") == "1"
+
+
+# 지연 import 표 (lazy_module로 미룬 모듈과 처음 사용할 때 import에 걸린 시간)
+def _show_deferred_imports():
+    names = list(lazy_imports.DEFERRED)
+    if not names:
+        return
+    times = dict(lazy_imports.IMPORT_TIMES)
+    loaded = [name for name in names if name in times]
+    st.caption(f"지연 import: {len(names)}개 중 {len(loaded)}개 불러옴, "
+               f"합계 {sum(times[name] for name in loaded) * 1000:.0f} ms")
+    rows = [
+        {"모듈": name, "import(ms)": round(times[name] * 1000, 1) if name in times else None,
+         "상태": "불러옴" if name in times else "아직 사용 안 함"}
+        for name in names
+    ]
+    st.dataframe(rows, hide_index=True)
+
+
+# 단계별 처리 시간 패널 (이 프로세스에서 모은 히스토그램 요약과 Prometheus 내보내기)
+def show_metrics_panel():
+    if not ADMIN:
+        return
+    with st.sidebar.expander("⏱️ 단계별 처리 시간", expanded=False):
+        _show_deferred_imports()
+        if not instrumentation.ENABLED:
+            st.caption("계측이 꺼져 있습니다 (ETHIC_METRICS=0).")
+            return
+        stats = instrumentation.snapshot()
+        if not stats:
+            st.caption("아직 기록된 단계가 없습니다.")
+        else:
+            rows = [
+                {
+                    "단계": stage,
+                    "횟수": s["count"],
+                    "평균(ms)": round(s["mean"] * 1000, 2),
+                    "p50(ms)": round(s["p50"] * 1000, 2),
+                    "p95(ms)": round(s["p95"] * 1000, 2),
+                    "최대(ms)": round(s["max"] * 1000, 2),
+                }
+                for stage, s in stats.items()
+            ]
+            st.dataframe(rows, hide_index=True)
+        if st.button("Prometheus 파일로 저장", key="admin_write_metrics"):
+            st.caption(f"저장됨: {instrumentation.write_prometheus()}")
+        if instrumentation.METRICS_PORT:
+            st.caption(f"엔드포인트: http://127.0.0.1:{instrumentation.METRICS_PORT}/metrics")
+        if st.button("기록 초기화", key="admin_reset_metrics"):
+            instrumentation.reset()
+
+
+# 추론 작업자 풀 패널 (요청 지연 시간 p50/p99와 묶음 크기 분포)
+def show_inference_panel():
+    if not ADMIN:
+        return
+    import inference_pool
+
+    with st.sidebar.expander("🧮 추론 작업자 풀", expanded=False):
+        pool = inference_pool.current_inference_pool()
+        if pool is None:
+            st.caption("아직 작업자 풀이 시작되지 않았습니다.")
+            return
+        stats = pool.stats()
+        latency = stats["latency_ms"]
+        st.caption(f"작업자 {pool.n_workers}개, 재시작 {pool.restarts}회, 대기 중 요청 {pool.pending()}개")
+        if not stats["requests"]:
+            st.caption("아직 처리한 요청이 없습니다.")
+            return
+        st.caption(f"요청 {stats['requests']}개, 묶음 {stats['batches']}개 (평균 {stats['mean_batch_size']:.1f}개씩)")
+        st.dataframe([{"p50(ms)": round(latency["p50"], 2), "p99(ms)": round(latency["p99"], 2),
+                       "최대(ms)": round(latency["max"], 2)}], hide_index=True)
+        st.bar_chart({"묶음 수": {str(size): count for size, count in stats["batch_size_hist"].items()}})
+
+
+# 프로세스 최대 메모리 사용량 (MB, resource 모듈이 없는 Windows에서는 None)
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# 메모리 사용량 패널 (세션별 음성 저장소와 공유 특성 캐시)
+def show_memory_panel():
+    if not ADMIN:
+        return
+    import feature_cache
+    import session_store
+
+    mb = 1024 * 1024
+    with st.sidebar.expander("💾 메모리 사용량", expanded=False):
+        stats = session_store.store.stats()
+        st.caption(f"세션 음성: {stats['memory_bytes'] / mb:.1f} / {stats['budget_bytes'] / mb:.0f} MB, "
+                   f"memmap 파일 {stats['disk_bytes'] / mb:.1f} / {stats['spill_budget_bytes'] / mb:.0f} MB, "
+                   f"정리된 세션 {stats['evictions']}개")
+        if stats["sessions"]:
+            rows = [
+                {
+                    "세션": s["session"][-8:],
+                    "항목": s["items"],
+                    "메모리(MB)": round(s["memory_bytes"] / mb, 2),
+                    "파일(MB)": round(s["disk_bytes"] / mb, 2),
+                    "형식": s["storage"],
+                    "미사용(초)": round(s["idle_seconds"]),
+                }
+                for s in stats["sessions"]
+            ]
+            st.dataframe(rows, hide_index=True)
+        cache = feature_cache.feature_cache.stats()
+        st.caption(f"특성 캐시: {cache['bytes'] / mb:.1f} / {cache['max_bytes'] / mb:.0f} MB, 항목 {cache['items']}개, "
+                   f"적중 {cache['hits']} / 실패 {cache['misses']}")
+        peak = _peak_rss_mb()
+        if peak is not None:
+            st.caption(f"프로세스 최대 메모리(RSS): {peak:.0f} MB")
+        if st.button("모든 세션 음성 정리", key="admin_clear_sessions"):
+            session_store.store.clear()
@@ -1,20 +1,24 @@
 import streamlit as st
-import numpy as np
-import librosa
-import matplotlib.pyplot as plt
-from sklearn.ensemble import RandomForestClassifier
-import tensorflow as tf
-from tensorflow.keras import layers, models
 import io
-import soundfile as sf
 import base64
+from lazy_imports import lazy_module
+
+# 무거운 모듈(librosa, tensorflow, sklearn 등)은 처음 사용할 때 불러옵니다 (앱 시작 시간 단축)
+np = lazy_module("numpy")
+librosa = lazy_module("librosa")
+plt = lazy_module("matplotlib.pyplot")
+ensemble = lazy_module("sklearn.ensemble")
+tf = lazy_module("tensorflow")
+layers = lazy_module("tensorflow.keras.layers")
+models = lazy_module("tensorflow.keras.models")
+sf = lazy_module("soundfile")
 
 # 페이지 설정
 st.set_page_config(page_title="딥페이크 음성 탐지", layout="wide")
 
-# 합성 오디오 생성 함수
+# 합성 오디오 생성 함수 (float32로 생성해서 float64의 절반 메모리만 사용)
 def generate_synthetic_audio(is_real=True, duration=3, sr=22050):
-    t = np.linspace(0, duration, int(sr * duration))
+    t = np.linspace(0, duration, int(sr * duration), dtype=np.float32)
     if is_real:
         # 자연스러운 주파수를 가진 진짜 음성 모사
         freq = 200 + 100 * np.sin(2 * np.pi * 0.1 * t)
@@ -22,7 +26,7 @@ def generate_synthetic_audio(is_real=True, duration=3, sr=22050):
     else:
         # 인위적 패턴과 노이즈를 더한 딥페이크 음성 모사
         freq = 200 + 50 * np.sin(2 * np.pi * 0.2 * t)
-        audio = 0.5 * np.sin(2 * np.pi * freq * t) + 0.1 * np.random.randn(len(t))
+        audio = 0.5 * np.sin(2 * np.pi * freq * t) + 0.1 * np.random.randn(len(t)).astype(np.float32)
     return audio, sr
 
 # MFCC 특성 추출 함수
@@ -42,7 +46,7 @@ def extract_spectrogram(audio, sr, n_mels=128, hop_length=512):
 # 오디오 재생 플레이어 생성 함수
 def get_audio_player(audio, sr):
     buffer = io.BytesIO()
-    sf.write(buffer, audio, sr, format='WAV')
+    sf.write(buffer, np.asarray(audio, dtype=np.float32), sr, format='WAV', subtype='PCM_16')
     audio_base64 = base64.b64encode(buffer.getvalue()).decode()
     audio_html = f'<audio controls><source src="data:audio/wav;base64,{audio_base64}" type="audio/wav"></audio>'
     return audio_html
@@ -0,0 +1,148 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from scipy.fft import rfft
+from scipy.signal import get_window, spectrogram
+
+from feature_ops import (dct_matrix, delta_coefficients, mel_filter_bank, mel_spectrogram_db, mfcc_from_mean_db,
+                         power_to_db)
+from instrumentation import timed
+
+# 음성 데이터와 특성 계산에 사용하는 실수 형식 (환경 변수로 변경 가능, 예: ETHIC_AUDIO_DTYPE=float64)
+# float32는 float64보다 메모리를 절반만 쓰고 FFT/행렬곱도 더 빠릅니다.
+AUDIO_DTYPE = np.dtype(os.environ.get("ETHIC_AUDIO_DTYPE", "float32"))
+
+# 음성 배열을 dtype(기본: AUDIO_DTYPE) 배열로 변환 (이미 같은 형식이면 복사하지 않음)
+def as_audio(audio, dtype=None):
+    return np.asarray(audio, dtype=AUDIO_DTYPE if dtype is None else dtype)
+
+# n_fft보다 짧은 음성의 끝을 0으로 채움 (마지막 축 기준)
+# scipy의 spectrogram은 짧은 입력에서 창 크기를 줄이므로, 채우지 않으면 Mel 필터 뱅크와 크기가 맞지 않습니다.
+def pad_to_window(audio, n_fft):
+    short = n_fft - audio.shape[-1]
+    if short <= 0:
+        return audio
+    return np.pad(audio, [(0, 0)] * (audio.ndim - 1) + [(0, short)])
+
+# 합성 오디오 생성 함수
+# rng를 넘기면 시드가 고정된 난수 생성기로 노이즈를 만들어 재현 가능한 학습 데이터를 얻습니다.
+@timed("generate_synthetic_audio")
+def generate_synthetic_audio(is_real=True, duration=3, sr=22050, rng=None, noise_level=0.1, dtype=None):
+    dtype = AUDIO_DTYPE if dtype is None else np.dtype(dtype)
+    t = np.linspace(0, duration, int(sr * duration), dtype=dtype)
+    if is_real:
+        # 자연스러운 주파수를 가진 진짜 음성 모사
+        freq = 200 + 100 * np.sin(2 * np.pi * 0.1 * t)
+        audio = 0.5 * np.sin(2 * np.pi * freq * t)
+    else:
+        # 인위적 패턴과 노이즈를 더한 딥페이크 음성 모사
+        freq = 200 + 50 * np.sin(2 * np.pi * 0.2 * t)
+        noise = rng.standard_normal(len(t), dtype=dtype) if rng is not None else np.random.randn(len(t)).astype(dtype)
+        audio = 0.5 * np.sin(2 * np.pi * freq * t) + noise_level * noise
+    return audio, sr
+
+# STFT 창 함수 (scipy.signal.spectrogram 기본값과 같은 Tukey 창)
+@lru_cache(maxsize=32)
+def get_stft_window(n_fft, dtype=np.float64):
+    window = get_window(('tukey', 0.25), n_fft).astype(dtype)
+    window.setflags(write=False)
+    return window
+
+# 잘라낸 프레임 (n_frames, n_fft)의 파워 스펙트럼 계산 -> (n_frames, n_fft // 2 + 1)
+# scipy.signal.spectrogram(mode='psd')와 같은 값을 내므로 프레임 단위로 나누어 계산해도 결과가 같습니다.
+# 계산은 frames와 같은 실수 형식으로 합니다 (float32 입력이면 결과도 float32).
+# numpy.fft는 항상 complex128로 계산하므로, 입력 형식을 유지하는 scipy.fft를 사용합니다.
+def power_spectrum(frames, sr, n_fft):
+    dtype = frames.dtype if frames.dtype.kind == 'f' else np.dtype(np.float64)
+    window = get_stft_window(n_fft, dtype)
+    frames = frames - frames.mean(axis=-1, keepdims=True)
+    frames *= window
+    spectrum = rfft(frames, axis=-1, overwrite_x=True)
+    psd = spectrum.real ** 2
+    psd += spectrum.imag ** 2
+    psd *= dtype.type(1 / (sr * np.sum(get_stft_window(n_fft) ** 2)))
+    psd[..., 1:-1 if n_fft % 2 == 0 else None] *= 2
+    return psd
+
+# MFCC 특성 추출 함수 (scipy + numpy 사용)
+# 음성을 dtype(기본: AUDIO_DTYPE)으로 바꾼 뒤 모든 단계를 같은 형식으로 계산합니다.
+@timed("extract_mfcc")
+def extract_mfcc(audio, sr, n_mfcc=13, n_fft=2048, hop_length=512, n_mels=40, dtype=None):
+    audio = pad_to_window(as_audio(audio, dtype), n_fft)
+    # 음성에서 퓨리에 변환 수행
+    freqs, times, Sxx = spectrogram(audio, fs=sr, nperseg=n_fft, noverlap=hop_length)
+
+    # dB Mel 스펙트로그램 (필터 뱅크는 파라미터별로 한 번만 생성)
+    mel_db = mel_spectrogram_db(Sxx, sr, n_fft, n_mels)
+
+    # 프레임 평균에 직교 정규화 DCT-II를 곱해서 MFCC 계산
+    return mfcc_from_mean_db(mel_db.mean(axis=-1), n_mfcc)
+
+# 프레임별 MFCC와 delta 특성 추출 함수 -> (n_frames, 2 * n_mfcc) 배열 (앞쪽 n_mfcc열: MFCC, 뒤쪽: delta)
+# extract_mfcc처럼 시간 평균으로 줄이지 않으므로 음성 앞부분만으로도 판단할 수 있습니다 (streaming.EarlyExitClassifier).
+# 프레임 간격과 값은 extract_mfcc와 같아서, 앞쪽 n_mfcc열의 평균은 extract_mfcc 결과와 같습니다.
+@timed("extract_mfcc_frames")
+def extract_mfcc_frames(audio, sr, n_mfcc=13, n_fft=2048, hop_length=512, n_mels=40, delta_width=9, dtype=None):
+    audio = pad_to_window(as_audio(audio, dtype), n_fft)
+    _, _, Sxx = spectrogram(audio, fs=sr, nperseg=n_fft, noverlap=hop_length)
+    mfcc = mel_spectrogram_db(Sxx, sr, n_fft, n_mels).T @ dct_matrix(n_mfcc, n_mels).T
+    if not len(mfcc):
+        return np.zeros((0, 2 * n_mfcc), dtype=mfcc.dtype)
+    return np.hstack([mfcc, delta_coefficients(mfcc, delta_width)])
+
+# Mel 스펙트로그램 이미지 추출 함수 (n_mels, n_frames) dB 값
+@timed("extract_spectrogram")
+def extract_spectrogram(audio, sr, n_mels=128, hop_length=512, n_fft=2048, dtype=None):
+    audio = pad_to_window(as_audio(audio, dtype), n_fft)
+    _, _, Sxx = spectrogram(audio, fs=sr, nperseg=n_fft, noverlap=hop_length)
+    return mel_spectrogram_db(Sxx, sr, n_fft, n_mels)
+
+# CNN 입력용 Mel 스펙트로그램 이미지 (app.py의 extract_spectrogram과 같은 128x128 크기)
+# audio는 (n_samples,) 또는 (n_clips, n_samples), 결과는 (..., n_mels, n_frames) float32 dB 값 (최댓값 기준, -80 dB에서 자름)
+def extract_mel_image(audio, sr, n_mels=128, n_frames=128, n_fft=2048, hop_length=512):
+    audio = pad_to_window(np.asarray(audio, dtype=np.float32), n_fft)
+    frames = np.lib.stride_tricks.sliding_window_view(audio, n_fft, axis=-1)[..., ::hop_length, :][..., :n_frames, :]
+    S_dB = power_to_db(power_spectrum(frames, sr, n_fft) @ mel_filter_bank(sr, n_fft, n_mels).T)
+    S_dB = np.maximum(S_dB - S_dB.max(axis=(-2, -1), keepdims=True), -80.0)
+    S_dB = np.swapaxes(S_dB, -1, -2)
+    if S_dB.shape[-1] < n_frames:
+        pad = [(0, 0)] * (S_dB.ndim - 1) + [(0, n_frames - S_dB.shape[-1])]
+        S_dB = np.pad(S_dB, pad, mode='constant', constant_values=-80.0)
+    return S_dB.astype(np.float32)
+
+# extract_mfcc_batch가 chunk 하나에서 쓰는 중간 배열 크기 상한 (바이트, 예: ETHIC_BATCH_BYTES=2097152)
+# 프레임 복사본 + 복소 스펙트럼 + 파워 스펙트럼이 L2 캐시(보통 1~2 MiB) 안에 들어가야 한 클립씩 처리하는 것보다 빠릅니다.
+# 1 MiB이면 float32, n_fft=2048 기준 약 50프레임 (1초 클립 3개, 3초 이상 클립은 1개씩).
+BATCH_BYTES = int(os.environ.get("ETHIC_BATCH_BYTES", 1 << 20))
+
+# 프레임 하나를 처리할 때 필요한 중간 배열 크기 (바이트)
+def frame_work_bytes(n_fft, dtype):
+    itemsize = np.dtype(dtype).itemsize
+    n_freqs = n_fft // 2 + 1
+    return n_fft * itemsize + n_freqs * 2 * itemsize + n_freqs * itemsize
+
+# 여러 클립의 MFCC를 한 번에 추출하는 함수 (extract_mfcc와 같은 값)
+# audio_batch: (n_clips, n_samples) 배열 -> (n_clips, n_mfcc) 배열
+# scipy.signal.spectrogram 대신 프레임을 직접 잘라 power_spectrum으로 계산하고 (float32 FFT),
+# 중간 배열이 CPU 캐시에 들어가도록 chunk_size개씩 나누어 처리합니다 (기본: BATCH_BYTES에 들어가는 클립 수).
+@timed("extract_mfcc_batch")
+def extract_mfcc_batch(audio_batch, sr, n_mfcc=13, n_fft=2048, hop_length=512, n_mels=40, chunk_size=None, dtype=None):
+    # memmap 입력을 한꺼번에 변환하지 않도록 형식 변환은 chunk 단위로 합니다.
+    audio_batch = np.atleast_2d(np.asarray(audio_batch))
+    dtype = AUDIO_DTYPE if dtype is None else np.dtype(dtype)
+    # spectrogram(noverlap=hop_length)와 같은 프레임 간격
+    step = n_fft - hop_length
+    mel_basis = mel_filter_bank(sr, n_fft, n_mels).astype(dtype, copy=False)
+    if chunk_size is None:
+        clip_frames = max(1, (audio_batch.shape[-1] - n_fft) // step + 1)
+        chunk_size = max(1, BATCH_BYTES // (clip_frames * frame_work_bytes(n_fft, dtype)))
+
+    out = np.empty((audio_batch.shape[0], n_mfcc), dtype=dtype)
+    for start in range(0, audio_batch.shape[0], chunk_size):
+        chunk = pad_to_window(as_audio(audio_batch[start:start + chunk_size], dtype), n_fft)
+        frames = np.lib.stride_tricks.sliding_window_view(chunk, n_fft, axis=-1)[:, ::step]
+        # (clips, frames, freqs) @ (freqs, mels) -> (clips, frames, mels)
+        mel_db = power_to_db(power_spectrum(frames, sr, n_fft) @ mel_basis.T)
+        out[start:start + chunk_size] = mfcc_from_mean_db(mel_db.mean(axis=-2), n_mfcc)
+    return out
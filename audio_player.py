@@ -0,0 +1,38 @@
+import io
+import os
+
+import numpy as np
+import soundfile as sf
+import streamlit as st
+
+from audio_features import as_audio
+from feature_cache import get_or_compute
+from instrumentation import timed
+
+# 재생용 인코딩 형식: (soundfile 형식, subtype, MIME 타입)
+AUDIO_FORMATS = {
+    "wav": ("WAV", "PCM_16", "audio/wav"),
+    "flac": ("FLAC", "PCM_16", "audio/flac"),
+    "ogg": ("OGG", "VORBIS", "audio/ogg"),
+}
+
+# 기본 재생 형식 (환경 변수로 변경 가능, 예: ETHIC_AUDIO_FORMAT=ogg)
+AUDIO_FORMAT = os.environ.get("ETHIC_AUDIO_FORMAT", "wav")
+
+
+# 오디오를 재생용 bytes로 인코딩 (기본은 16비트 PCM WAV, float64 WAV의 1/4 크기)
+@timed("encode_audio")
+def encode_audio(audio, sr, fmt=AUDIO_FORMAT):
+    file_format, subtype, mime = AUDIO_FORMATS[fmt]
+    buffer = io.BytesIO()
+    # AUDIO_DTYPE(기본 float32)로 자르기를 계산해서 float64 임시 배열을 만들지 않음
+    sf.write(buffer, np.clip(as_audio(audio), -1.0, 1.0), sr, format=file_format, subtype=subtype)
+    return buffer.getvalue(), mime
+
+
+# 오디오 재생 플레이어 표시 함수
+# 인코딩 결과는 음성 내용 해시로 캐시하고, st.audio로 넘겨서 base64 HTML 대신
+# Streamlit 미디어 서버의 URL(구간 요청 지원)로 브라우저에 전달합니다.
+def show_audio_player(audio, sr, fmt=AUDIO_FORMAT):
+    data = get_or_compute(f"audio:{fmt}", audio, sr, lambda: encode_audio(audio, sr, fmt)[0])
+    st.audio(data, format=AUDIO_FORMATS[fmt][2])
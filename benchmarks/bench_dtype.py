@@ -0,0 +1,77 @@
+# float32 / float64 음성 경로 비교 벤치마크
+# 같은 음성을 두 형식으로 계산해서 특성 값의 차이, 분류 결과 일치율, 속도와 메모리를 비교합니다.
+# 사용법: python benchmarks/bench_dtype.py --clips 200 [--tolerance 1e-3]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_features import (  # noqa: E402
+    extract_mfcc, extract_mfcc_batch, extract_spectrogram, generate_synthetic_audio,
+)
+from model_registry import get_rf_model  # noqa: E402
+
+DTYPES = ("float64", "float32")
+
+
+# 가장 빠른 실행 시간(초) 측정
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="float32/float64 음성 경로 비교")
+    parser.add_argument("--clips", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=3)
+    parser.add_argument("--sr", type=int, default=22050)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=1e-3, help="허용하는 MFCC 상대 오차")
+    args = parser.parse_args()
+
+    # 기준 음성은 float64로 생성하고, 각 형식으로 변환해서 같은 신호로 비교
+    rng = np.random.default_rng(0)
+    clips64 = np.stack([generate_synthetic_audio(is_real=bool(i % 2), duration=args.duration, sr=args.sr,
+                                                 rng=rng, dtype="float64")[0] for i in range(args.clips)])
+    clips = {dtype: clips64.astype(dtype) for dtype in DTYPES}
+
+    # 생성 단계: 노이즈가 없는 진짜 음성은 형식만 다르고 같은 신호이므로 직접 비교
+    real = {dtype: generate_synthetic_audio(is_real=True, duration=args.duration, sr=args.sr, dtype=dtype)[0]
+            for dtype in DTYPES}
+    print(f"생성: 진짜 음성 최대 차이 {np.abs(real['float32'] - real['float64']).max():.2e}")
+
+    features, spectrograms = {}, {}
+    for dtype in DTYPES:
+        t_batch, features[dtype] = best_time(lambda: extract_mfcc_batch(clips[dtype], args.sr, dtype=dtype),
+                                             args.repeat)
+        t_single, _ = best_time(lambda: [extract_mfcc(c, args.sr, dtype=dtype) for c in clips[dtype][:20]],
+                                args.repeat)
+        t_spec, spectrograms[dtype] = best_time(lambda: extract_spectrogram(clips[dtype][0], args.sr, dtype=dtype),
+                                                args.repeat)
+        print(f"{dtype}: 음성 {clips[dtype].nbytes / 1e6:7.1f} MB  "
+              f"배치 MFCC {args.clips / t_batch:7.1f} clips/s  "
+              f"단일 MFCC {20 / t_single:7.1f} clips/s  "
+              f"스펙트로그램 {t_spec * 1000:6.2f} ms ({spectrograms[dtype].nbytes / 1e3:.0f} KB)")
+
+    ref, f32 = features["float64"], features["float32"].astype(np.float64)
+    rel_error = np.abs(f32 - ref).max() / np.abs(ref).max()
+    spec_error = np.abs(spectrograms["float32"] - spectrograms["float64"]).max()
+
+    rf_model = get_rf_model()
+    agreement = np.mean(rf_model.predict(ref) == rf_model.predict(f32))
+    print(f"\nMFCC 최대 상대 오차 {rel_error:.2e}, 스펙트로그램 최대 차이 {spec_error:.2e} dB")
+    print(f"분류 결과 일치율 {agreement * 100:.1f}%")
+
+    if rel_error > args.tolerance or agreement < 1.0:
+        raise SystemExit("float32 결과가 float64 기준과 허용 범위 이상 다릅니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# 음성 특성 추출/분류 주요 경로 벤치마크
+# Streamlit 페이지를 실행하지 않고 audio_features 등 모듈의 함수를 직접 측정합니다.
+# 사용법: python benchmarks/bench_hotpaths.py -o bench.json [--compare 이전결과.json]
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import scipy
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_features import (  # noqa: E402
+    extract_mfcc, extract_mfcc_batch, extract_spectrogram, generate_synthetic_audio,
+)
+from audio_player import encode_audio  # noqa: E402
+
+# librosa는 app.py에서만 사용하므로 설치된 경우에만 비교
+HAS_LIBROSA = importlib.util.find_spec("librosa") is not None
+
+DURATIONS = [1.0, 3.0, 10.0, 30.0]
+SAMPLE_RATES = [16000, 22050, 44100]
+
+
+# 실행 시간(ms)과 최대 메모리 사용량(KB) 측정
+def measure(fn, repeat):
+    fn()  # 캐시/지연 import 준비
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"mean_ms": float(np.mean(times)), "min_ms": float(np.min(times)), "peak_kb": peak / 1024}
+
+
+# 길이/샘플레이트별 특성 추출 경로
+def feature_cases(duration, sr):
+    rng = np.random.default_rng(0)
+    real, _ = generate_synthetic_audio(is_real=True, duration=duration, sr=sr)
+    fake, _ = generate_synthetic_audio(is_real=False, duration=duration, sr=sr, rng=rng)
+    cases = {
+        "generate_synthetic_audio[real]": lambda: generate_synthetic_audio(is_real=True, duration=duration, sr=sr),
+        "generate_synthetic_audio[fake]": lambda: generate_synthetic_audio(is_real=False, duration=duration, sr=sr,
+                                                                           rng=rng),
+        "extract_mfcc[scipy]": lambda: extract_mfcc(fake, sr),
+        "extract_spectrogram[scipy]": lambda: extract_spectrogram(fake, sr),
+        "encode_audio[wav]": lambda: encode_audio(fake, sr, "wav"),
+    }
+    if HAS_LIBROSA:
+        import librosa
+        # app.py의 extract_mfcc / extract_spectrogram과 같은 호출
+        cases["extract_mfcc[librosa]"] = lambda: librosa.feature.mfcc(y=fake, sr=sr, n_mfcc=13).mean(axis=1)
+        cases["extract_spectrogram[librosa]"] = lambda: librosa.power_to_db(
+            librosa.feature.melspectrogram(y=fake, sr=sr, n_mels=128, hop_length=512), ref=np.max)
+    return cases
+
+
+# 랜덤 포레스트 학습/예측 경로 (기본 3초, 22050 Hz 학습 데이터 100개)
+def model_cases():
+    rng = np.random.default_rng(0)
+    clips = np.stack([generate_synthetic_audio(is_real=bool(i % 2), rng=rng)[0] for i in range(100)])
+    labels = np.arange(100) % 2
+    X = extract_mfcc_batch(clips, 22050)
+    rf_model = RandomForestClassifier(n_estimators=100, random_state=42).fit(X, labels)
+    return {
+        "extract_mfcc_batch[100 clips]": lambda: extract_mfcc_batch(clips, 22050),
+        "rf.fit[100 trees]": lambda: RandomForestClassifier(n_estimators=100, random_state=42).fit(X, labels),
+        "rf.predict[1 row]": lambda: rf_model.predict(X[:1]),
+        "rf.predict_proba[100 rows]": lambda: rf_model.predict_proba(X),
+    }
+
+
+# 이전 결과와 비교해서 느려진/빨라진 정도 출력
+def compare(results, old_path):
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = {(r["name"], r["duration"], r["sr"]): r for r in json.load(f)["results"]}
+    print(f"\n{old_path} 대비 (min_ms 비율, 1보다 크면 느려짐)")
+    for r in results:
+        prev = old.get((r["name"], r["duration"], r["sr"]))
+        if prev:
+            print(f"{r['name']:<34} {r['duration']:>4}s {r['sr']:>6} Hz  x{r['min_ms'] / prev['min_ms']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="음성 특성/분류 주요 경로 벤치마크")
+    parser.add_argument("-o", "--output", default="bench_hotpaths.json")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--durations", type=float, nargs="+", default=DURATIONS)
+    parser.add_argument("--sample-rates", type=int, nargs="+", default=SAMPLE_RATES)
+    args = parser.parse_args()
+
+    results = []
+
+    def record(name, duration, sr, stats):
+        results.append(dict(name=name, duration=duration, sr=sr, **stats))
+        print(f"{name:<34} {duration:>4}s {sr:>6} Hz  mean {stats['mean_ms']:9.2f} ms  "
+              f"min {stats['min_ms']:9.2f} ms  peak {stats['peak_kb']:10.1f} KB")
+
+    for sr in args.sample_rates:
+        for duration in args.durations:
+            for name, fn in feature_cases(duration, sr).items():
+                record(name, duration, sr, measure(fn, args.repeat))
+    for name, fn in model_cases().items():
+        record(name, 3, 22050, measure(fn, args.repeat))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "sklearn": sklearn.__version__,
+            "librosa": HAS_LIBROSA,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
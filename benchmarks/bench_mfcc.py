@@ -0,0 +1,73 @@
+# MFCC 추출 속도 비교 벤치마크
+# 사용법: python benchmarks/bench_mfcc.py --clips 100 --duration 3 --repeat 3
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.fft import dct
+from scipy.signal import spectrogram
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_features import BATCH_BYTES, generate_synthetic_audio, extract_mfcc, extract_mfcc_batch  # noqa: E402
+
+
+# 기존 voice.py의 extract_mfcc (호출마다 필터 뱅크를 다시 만드는 버전)
+def legacy_extract_mfcc(audio, sr, n_mfcc=13, n_fft=2048, hop_length=512, n_mels=40):
+    freqs, times, Sxx = spectrogram(audio, fs=sr, nperseg=n_fft, noverlap=hop_length)
+    mel_filters = np.zeros((n_mels, len(freqs)))
+    mel_freqs = np.linspace(0, sr / 2, n_mels + 2)
+    for i in range(1, len(mel_freqs) - 1):
+        start = int(np.floor(mel_freqs[i - 1] / (sr / 2) * len(freqs)))
+        end = int(np.floor(mel_freqs[i] / (sr / 2) * len(freqs)))
+        mel_filters[i - 1, start:end] = np.linspace(0, 1, end - start)
+    mel_spectrogram = np.dot(mel_filters, np.abs(Sxx))
+    mel_log = np.log(mel_spectrogram + 1e-9)
+    mfcc = dct(mel_log, type=2, axis=0)[:n_mfcc]
+    return np.mean(mfcc.T, axis=0)
+
+
+# 가장 빠른 실행 시간(초) 측정
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MFCC 추출 벤치마크 (clips/second)")
+    parser.add_argument("--clips", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=3)
+    parser.add_argument("--sr", type=int, default=22050)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    clips = np.stack([
+        generate_synthetic_audio(is_real=bool(i % 2), duration=args.duration, sr=args.sr, rng=rng)[0]
+        for i in range(args.clips)
+    ])
+
+    # max|diff|는 현재 extract_mfcc(한 클립씩) 결과와 비교 (legacy는 필터 뱅크/로그가 다른 알고리즘이라 비교하지 않음)
+    cases = [
+        ("extract_mfcc (loop)", lambda: np.array([extract_mfcc(a, args.sr) for a in clips]), True),
+        ("extract_mfcc_batch", lambda: extract_mfcc_batch(clips, args.sr), True),
+        ("legacy extract_mfcc (loop)", lambda: np.array([legacy_extract_mfcc(a, args.sr) for a in clips]), False),
+    ]
+
+    print(f"{args.clips} clips x {args.duration}s @ {args.sr} Hz, best of {args.repeat}, BATCH_BYTES={BATCH_BYTES}")
+    reference = None
+    for name, fn, compare in cases:
+        elapsed, result = best_time(fn, args.repeat)
+        if reference is None:
+            reference = result
+        diff = f"max|diff|={np.max(np.abs(result - reference)):.2e}" if compare else "max|diff|=-"
+        print(f"{name:<28} {elapsed * 1000:9.1f} ms  {args.clips / elapsed:9.1f} clips/s  {diff}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# 샘플레이트 변환 속도 비교 벤치마크 (ingest vs scipy 기본 호출 vs librosa)
+# 사용법: python benchmarks/bench_resample.py --duration 10 --repeat 5
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.signal import resample_poly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ingest import MODEL_SR, resample, resample_filter, resample_ratio  # noqa: E402
+
+# librosa는 app.py에서만 사용하므로 설치된 경우에만 비교
+HAS_LIBROSA = importlib.util.find_spec("librosa") is not None
+
+SAMPLE_RATES = [8000, 16000, 44100, 48000]
+
+
+# 가장 빠른 실행 시간(초) 측정
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샘플레이트 변환 속도 비교")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sample-rates", type=int, nargs="+", default=SAMPLE_RATES)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{args.duration:.0f}초, {args.channels}채널 -> {MODEL_SR} Hz 모노 (실시간 대비 배속)")
+    for sr in args.sample_rates:
+        audio = (0.1 * rng.standard_normal((int(sr * args.duration), args.channels))).astype(np.float32)
+        up, down = resample_ratio(sr, MODEL_SR)
+
+        # 처음 호출(필터 설계 포함)과 이후 호출(캐시된 필터 사용)을 구분해서 측정
+        resample_filter.cache_clear()
+        cold, _ = best_time(lambda: resample(audio, sr), 1)
+        cases = {
+            "ingest (cold)": (cold, None),
+            "ingest": best_time(lambda: resample(audio, sr)[0], args.repeat),
+            "scipy resample_poly": best_time(lambda: resample_poly(audio.mean(axis=1), up, down), args.repeat),
+        }
+        if HAS_LIBROSA:
+            import librosa
+            for res_type in ("soxr_hq", "polyphase"):
+                cases[f"librosa.resample[{res_type}]"] = best_time(
+                    lambda: librosa.resample(audio.T, orig_sr=sr, target_sr=MODEL_SR, res_type=res_type).mean(axis=0),
+                    args.repeat)
+
+        reference = cases["scipy resample_poly"][1]
+        print(f"\n{sr} Hz (up {up}, down {down})")
+        for name, (seconds, result) in cases.items():
+            line = f"  {name:<30} {seconds * 1000:9.2f} ms  {args.duration / seconds:8.0f}x"
+            if result is not None and len(result) == len(reference):
+                line += f"  resample_poly와의 최대 차이 {np.abs(result - reference).max():.1e}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
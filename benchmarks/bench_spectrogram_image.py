@@ -0,0 +1,65 @@
+# 스펙트로그램 이미지 생성 속도 비교 벤치마크 (matplotlib 그림 vs 색상표 LUT 직접 인코딩)
+# 사용법: python benchmarks/bench_spectrogram_image.py --duration 60 --repeat 5
+import argparse
+import io
+import os
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_features import extract_spectrogram  # noqa: E402
+from spectrogram_image import colormap_lut, render_spectrogram, render_tile  # noqa: E402
+
+
+# 가장 빠른 실행 시간(초) 측정
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+# 기존 방식: matplotlib 그림을 만들어 PNG로 저장
+def render_matplotlib(S_dB):
+    fig, ax = plt.subplots()
+    ax.imshow(S_dB, aspect="auto", cmap="inferno", origin="lower")
+    ax.set(title="Mel spectrogram")
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스펙트로그램 이미지 생성 속도 비교")
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--sr", type=int, default=22050)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    audio = (0.1 * np.random.default_rng(0).standard_normal(int(args.sr * args.duration))).astype(np.float32)
+    S_dB = extract_spectrogram(audio, args.sr)
+    colormap_lut()  # 색상표 생성은 프로세스당 한 번이므로 측정에서 제외
+    tile_frames = max(1, round(S_dB.shape[1] * 5 / args.duration))
+
+    cases = {
+        "matplotlib (figure + savefig)": best_time(lambda: render_matplotlib(S_dB), args.repeat),
+        "LUT -> PNG": best_time(lambda: render_spectrogram(S_dB, fmt="png"), args.repeat),
+        "LUT -> WebP (lossless)": best_time(lambda: render_spectrogram(S_dB, fmt="webp"), args.repeat),
+        "LUT -> PNG, 5초 구간 1개": best_time(lambda: render_tile(S_dB, 0, tile_frames, fmt="png"), args.repeat),
+    }
+    print(f"{args.duration:.0f}초 음성, 스펙트로그램 {S_dB.shape[0]} x {S_dB.shape[1]}")
+    for name, (seconds, data) in cases.items():
+        print(f"  {name:<32} {seconds * 1000:8.1f} ms  {len(data) / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# feature_ops의 Mel 필터 뱅크 / DCT / MFCC를 librosa와 비교하는 검사 스크립트 (librosa 필요)
+# 사용법: python benchmarks/check_librosa_mfcc.py [--clips 20] [--tolerance 1e-4]
+import argparse
+import os
+import sys
+
+import numpy as np
+from scipy.fft import dct
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_features import extract_mfcc, generate_synthetic_audio  # noqa: E402
+from feature_ops import dct_matrix, mel_filter_bank, mel_spectrogram_db  # noqa: E402
+
+# (sr, n_fft, n_mels) 비교 조합
+BANK_CONFIGS = [(16000, 512, 40), (22050, 2048, 40), (22050, 2048, 128), (44100, 2048, 128)]
+
+
+# 최대 상대 오차
+def rel_error(a, b):
+    return float(np.abs(np.asarray(a, dtype=np.float64) - b).max() / np.abs(b).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="librosa와 MFCC 연산자 비교")
+    parser.add_argument("--clips", type=int, default=20)
+    parser.add_argument("--sr", type=int, default=22050)
+    parser.add_argument("--n-mfcc", type=int, default=13)
+    parser.add_argument("--n-mels", type=int, default=128, help="app.py(librosa 기본값)와 같은 128")
+    parser.add_argument("--tolerance", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    try:
+        import librosa
+    except ImportError:
+        raise SystemExit("librosa가 설치되어 있지 않습니다 (pip install librosa).")
+
+    errors = {}
+    for sr, n_fft, n_mels in BANK_CONFIGS:
+        ref = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)
+        errors[f"mel_filter_bank{(sr, n_fft, n_mels)}"] = rel_error(mel_filter_bank(sr, n_fft, n_mels), ref)
+
+    x = np.random.default_rng(0).standard_normal((8, args.n_mels))
+    ref = dct(x, type=2, norm="ortho", axis=-1)[:, :args.n_mfcc]
+    errors["dct_matrix"] = rel_error(x @ dct_matrix(args.n_mfcc, args.n_mels).T, ref)
+
+    # 같은 파워 스펙트로그램에서 프레임별 MFCC 비교 (STFT 방식의 차이를 빼고 연산자만 비교)
+    rng = np.random.default_rng(0)
+    n_fft, hop_length = 2048, 512
+    frame_errors, app_corr = [], []
+    for i in range(args.clips):
+        audio, sr = generate_synthetic_audio(is_real=bool(i % 2), sr=args.sr, rng=rng)
+        S = np.abs(librosa.stft(audio.astype(np.float64), n_fft=n_fft, hop_length=hop_length)) ** 2
+        mel_ref = librosa.feature.melspectrogram(S=S, sr=sr, n_mels=args.n_mels)
+        mfcc_ref = librosa.feature.mfcc(S=librosa.power_to_db(mel_ref, top_db=None), n_mfcc=args.n_mfcc)
+        mfcc = dct_matrix(args.n_mfcc, args.n_mels) @ mel_spectrogram_db(S, sr, n_fft, args.n_mels)
+        frame_errors.append(rel_error(mfcc, mfcc_ref))
+
+        # app.py의 extract_mfcc(librosa 기본 설정)와 프레임 평균 MFCC의 상관계수 (STFT 창/간격이 달라 참고용)
+        app_mfcc = np.mean(librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=args.n_mfcc), axis=1)
+        ours = extract_mfcc(audio, sr, n_mfcc=args.n_mfcc, n_mels=args.n_mels)
+        app_corr.append(np.corrcoef(app_mfcc[1:], ours[1:])[0, 1])
+    errors["mfcc(frames, same power)"] = max(frame_errors)
+
+    for name, err in errors.items():
+        print(f"{name:<40} 최대 상대 오차 {err:.2e}")
+    print(f"{'app.py extract_mfcc 상관계수 (c1..)':<40} 최소 {min(app_corr):.3f}, 평균 {np.mean(app_corr):.3f}")
+
+    if max(errors.values()) > args.tolerance:
+        raise SystemExit("librosa와의 차이가 허용 범위를 넘었습니다.")
+
+
+if __name__ == "__main__":
+    main()
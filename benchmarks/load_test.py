@@ -0,0 +1,396 @@
+# Streamlit 페이지 부하 테스트 (AppTest로 브라우저/네트워크 없이 여러 학생 세션을 동시에 실행)
+# 각 가상 사용자는 실제 학생처럼 메뉴 이동 -> 음성 생성/업로드 -> "학습 후 분류 실행" -> 의견 제출을 하고,
+# 상호작용별 지연 시간 분위수, 처리량, CPU 사용량, 최대 메모리(RSS)를 보고합니다.
+# 실제 Streamlit 서버처럼 모든 세션을 한 프로세스의 스레드로 실행하므로, 세션들이 추론 풀과 st.cache 저장소를 함께 씁니다.
+# (AppTest는 실행마다 Runtime 인스턴스를 바꾸므로 share_app_test_runtime으로 프로세스 전체에서 하나만 쓰도록 고정합니다.)
+# 의견은 임시 SQLite 파일에 저장하므로 실제 opinions.db/data.txt는 바뀌지 않습니다.
+# 사용법: python benchmarks/load_test.py --users 20 --concurrency 10 --scenario voice run --json load.json
+#         python benchmarks/load_test.py --users 30 --max-p95-ms 5000   # 기준을 넘거나 오류가 있으면 종료 코드 1
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 시나리오별 페이지 스크립트
+SCRIPTS = {"voice": "voice.py", "run": "run.py"}
+
+# AppTest 한 번 실행의 제한 시간(초)
+TIMEOUT = 300
+
+# 자원 사용량 측정 간격(초)
+SAMPLE_INTERVAL = 0.1
+
+
+# Recorder.step이 이미 기록한 오류 (시나리오를 중단할 때 사용하며 다시 세지 않음)
+class StepError(RuntimeError):
+    pass
+
+
+# 상호작용별 지연 시간과 오류 기록 (여러 스레드가 함께 사용)
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.error_types = {}
+        self.messages = []
+        self._lock = threading.Lock()
+
+    # fn()을 실행하고 걸린 시간 기록, fn()은 AppTest를 반환 (스크립트 예외와 st.error 메시지도 오류로 셈)
+    def step(self, stage, fn):
+        start = time.perf_counter()
+        at = error = error_type = None
+        try:
+            at = fn()
+            if at.exception:
+                error = at.exception[0].message
+                error_type = at.exception[0].proto.type or "ScriptException"
+            elif at.error:
+                error, error_type = at.error[0].value, "st.error"
+        except Exception as e:
+            error, error_type = f"{type(e).__name__}: {e}", type(e).__name__
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.latencies.setdefault(stage, []).append(elapsed)
+        if error is not None:
+            self._add_error(stage, error_type, error)
+            raise StepError(error)
+        return at
+
+    # 상호작용 밖에서 난 예외 기록 (요소를 찾지 못한 경우, 사용자 스레드가 실패한 경우 등)
+    def record_error(self, stage, exc):
+        self._add_error(stage, type(exc).__name__, f"{type(exc).__name__}: {exc}")
+
+    def _add_error(self, stage, error_type, message):
+        with self._lock:
+            self.errors[stage] = self.errors.get(stage, 0) + 1
+            self.error_types[error_type] = self.error_types.get(error_type, 0) + 1
+            if len(self.messages) < 10:
+                self.messages.append(f"{stage}: {message}")
+
+    # 전체 오류 수 (상호작용 밖의 오류 포함)
+    def error_count(self):
+        with self._lock:
+            return sum(self.errors.values())
+
+    # 상호작용별 요약 (횟수, 오류, 분위수, 단위: 초)
+    def summary(self):
+        with self._lock:
+            return {
+                stage: {
+                    "count": len(values),
+                    "errors": self.errors.get(stage, 0),
+                    "p50": float(np.percentile(values, 50)),
+                    "p90": float(np.percentile(values, 90)),
+                    "p95": float(np.percentile(values, 95)),
+                    "p99": float(np.percentile(values, 99)),
+                    "max": float(np.max(values)),
+                }
+                for stage, values in self.latencies.items()
+            }
+
+
+def _button(at, label, sidebar=False):
+    buttons = at.sidebar.button if sidebar else at.button
+    return next(b for b in buttons if b.label == label)
+
+
+def _text_area(at, label):
+    return next(t for t in at.text_area if t.label == label)
+
+
+# 딥페이크 음성 페이지: 메뉴 -> 음성 생성(또는 업로드) -> 분류 -> 홈에서 의견 제출
+def voice_session(rec, user, upload):
+    path = os.path.join(ROOT, SCRIPTS["voice"])
+    from streamlit.testing.v1 import AppTest
+    at = rec.step("voice:load", lambda: AppTest.from_file(path, default_timeout=TIMEOUT).run())
+    rec.step("voice:menu", lambda: at.sidebar.radio[0].set_value("딥페이크 음성").run())
+    if upload is not None and user % 2:
+        rec.step("voice:upload", lambda: at.file_uploader[0].upload("load_test.wav", upload, "audio/wav").run())
+    else:
+        label = "진짜 음성 생성" if user % 2 == 0 else "가짜 음성 생성"
+        rec.step("voice:generate", lambda: _button(at, label).click().run())
+    rec.step("voice:classify", lambda: _button(at, "학습 후 분류 실행").click().run())
+    rec.step("voice:home", lambda: at.sidebar.radio[0].set_value("홈").run())
+    _text_area(at, "의견을 입력하세요:").input(f"부하 테스트 의견 (voice, 사용자 {user})")
+    rec.step("voice:opinion", lambda: _button(at, "의견 제출").click().run())
+
+
+# 메인 페이지: 의견 제출 -> 학생 데이터 보기
+def run_session(rec, user, upload):
+    path = os.path.join(ROOT, SCRIPTS["run"])
+    from streamlit.testing.v1 import AppTest
+    at = rec.step("run:load", lambda: AppTest.from_file(path, default_timeout=TIMEOUT).run())
+    _text_area(at, "인공지능 윤리에 대한 의견 또는 질문을 작성해주세요:").input(f"부하 테스트 의견 (run, 사용자 {user})")
+    rec.step("run:opinion", lambda: _button(at, "제출하기").click().run())
+    rec.step("run:student_data", lambda: _button(at, "학생데이터(더블클릭)", sidebar=True).click().run())
+
+
+SESSIONS = {"voice": voice_session, "run": run_session}
+
+
+# 업로드용 WAV (합성 음성, 44.1 kHz 스테레오: 실제 업로드처럼 샘플레이트 변환과 채널 합치기를 거침)
+def make_upload(seconds):
+    import soundfile as sf
+    from audio_features import generate_synthetic_audio
+    audio, sr = generate_synthetic_audio(is_real=True, duration=seconds, sr=44100)
+    buffer = io.BytesIO()
+    sf.write(buffer, np.stack([audio, audio], axis=1), sr, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+# 현재 프로세스(앱)와 그 아래 작업자 프로세스(추론 풀)의 CPU 시간, RSS를 주기적으로 측정
+# /proc가 있는 Linux에서만 하위 프로세스를 측정할 수 있고, 그 밖에서는 현재 프로세스만 측정합니다.
+class ResourceMonitor:
+    def __init__(self):
+        self.has_proc = os.path.exists("/proc/self/stat")
+        self._page = os.sysconf("SC_PAGE_SIZE") if self.has_proc else 0
+        self._ticks = os.sysconf("SC_CLK_TCK") if self.has_proc else 1
+        self.peak_rss = 0
+        self._worker_cpu = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="load-test-monitor", daemon=True)
+
+    def _stat_fields(self, pid):
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            return f.read().rsplit(b")", 1)[1].split()
+
+    def _read_proc(self, pid):
+        fields = self._stat_fields(pid)
+        cpu = (int(fields[11]) + int(fields[12])) / self._ticks  # utime + stime
+        with open(f"/proc/{pid}/statm", "rb") as f:
+            rss = int(f.read().split()[1]) * self._page
+        return cpu, rss
+
+    # 현재 프로세스의 모든 하위 프로세스 pid (추론 작업자와 그 보조 프로세스)
+    def _descendants(self):
+        parents = {}
+        for name in os.listdir("/proc"):
+            if name.isdigit():
+                try:
+                    parents.setdefault(int(self._stat_fields(name)[1]), []).append(int(name))
+                except (OSError, ValueError, IndexError):
+                    continue  # 방금 종료된 프로세스
+        pids, frontier = [], [os.getpid()]
+        while frontier:
+            children = parents.get(frontier.pop(), ())
+            pids.extend(children)
+            frontier.extend(children)
+        return pids
+
+    # 현재 RSS 합계 (바이트), 작업자 CPU 시간도 갱신
+    def sample(self):
+        if not self.has_proc:
+            import resource
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+            self.peak_rss = max(self.peak_rss, rss)
+            return rss
+        total = self._read_proc("self")[1]
+        for pid in self._descendants():
+            try:
+                cpu, rss = self._read_proc(pid)
+            except (OSError, ValueError, IndexError):
+                continue  # 방금 종료된 프로세스
+            self._worker_cpu[pid] = cpu
+            total += rss
+        self.peak_rss = max(self.peak_rss, total)
+        return total
+
+    def _run(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def start(self):
+        self.start_rss = self.sample()
+        self._start_cpu = dict(self._worker_cpu)
+        self._times = os.times()
+        self._wall = time.perf_counter()
+        self._thread.start()
+
+    # 측정 종료 -> 평균 사용 코어 수, CPU 초, RSS
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+        wall = time.perf_counter() - self._wall
+        times = os.times()
+        app_cpu = (times.user - self._times.user) + (times.system - self._times.system)
+        worker_cpu = sum(cpu - self._start_cpu.get(pid, 0.0) for pid, cpu in self._worker_cpu.items())
+        return {
+            "app_cpu_seconds": app_cpu,
+            "worker_cpu_seconds": worker_cpu,
+            "avg_cores": (app_cpu + worker_cpu) / wall,
+            "start_rss_mb": self.start_rss / 1024 / 1024,
+            "peak_rss_mb": self.peak_rss / 1024 / 1024,
+            "includes_workers": self.has_proc,
+        }
+
+
+# AppTest가 프로세스 전체에서 가짜 Runtime 하나를 함께 쓰도록 고정
+# AppTest는 실행할 때마다 Runtime._instance를 새 가짜 Runtime으로 바꾸고 끝나면 None으로 되돌리므로,
+# 여러 스레드에서 그대로 실행하면 다른 세션이 실행 중인 Runtime을 지웁니다.
+# app_test 모듈이 쓰는 Runtime을 하위 클래스로 바꿔서 AppTest의 대입은 그 클래스에만 남게 하고,
+# 페이지가 읽는 Runtime.instance()는 여기서 만든 Runtime(미디어 파일, st.cache 저장소 공유)을 돌려주게 합니다.
+# 스크립트 바이트코드 캐시도 실제 서버처럼 함께 씁니다 (Python 3.11은 여러 스레드가 동시에 컴파일하면 SystemError가 날 수 있음).
+def share_app_test_runtime():
+    from unittest.mock import MagicMock
+
+    from streamlit.components.v2.component_manager import BidiComponentManager
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.bidi_component_registry = BidiComponentManager()
+    runtime.bidi_component_registry.discover_and_register_components(start_file_watching=False)
+    Runtime._instance = runtime
+    app_test.Runtime = type("SessionRuntime", (Runtime,), {})
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+
+# 가상 사용자 한 명: 시나리오들을 차례로 실행 (실패한 시나리오는 오류로 기록하고 다음으로)
+def simulate_user(rec, user, scenarios, upload, iterations):
+    for _ in range(iterations):
+        for name in scenarios:
+            try:
+                SESSIONS[name](rec, user, upload)
+            except StepError:
+                pass  # Recorder.step에서 이미 기록됨
+            except Exception as e:
+                rec.record_error(f"{name}:session", e)
+
+
+def print_report(report, file=sys.stdout):
+    print(f"\n사용자 {report['users']}명 (동시 {report['concurrency']}명), 시나리오 {', '.join(report['scenarios'])}, "
+          f"{report['wall_seconds']:.1f}초", file=file)
+    print(f"처리량: 세션 {report['sessions_per_second']:.2f}/s, 상호작용 {report['interactions_per_second']:.2f}/s",
+          file=file)
+    print(f"{'상호작용':<20} {'횟수':>5} {'오류':>5} {'p50(ms)':>9} {'p90(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} "
+          f"{'최대(ms)':>9}", file=file)
+    for stage, s in report["stages"].items():
+        print(f"{stage:<20} {s['count']:>5} {s['errors']:>5} {s['p50'] * 1000:>9.0f} {s['p90'] * 1000:>9.0f} "
+              f"{s['p95'] * 1000:>9.0f} {s['p99'] * 1000:>9.0f} {s['max'] * 1000:>9.0f}", file=file)
+    if report["error_types"]:
+        print("오류 종류: " + ", ".join(f"{name} {count}개" for name, count in report["error_types"].items()),
+              file=file)
+    r = report["resources"]
+    workers = " (추론 작업자 포함)" if r["includes_workers"] else " (현재 프로세스만)"
+    print(f"CPU: 평균 {r['avg_cores']:.2f}코어{workers}, 앱 {r['app_cpu_seconds']:.1f}초, "
+          f"작업자 {r['worker_cpu_seconds']:.1f}초", file=file)
+    print(f"RSS: 시작 {r['start_rss_mb']:.0f} MB, 최대 {r['peak_rss_mb']:.0f} MB{workers}", file=file)
+    for message in report["error_messages"]:
+        print(f"오류: {message}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AppTest로 여러 학생 세션을 동시에 실행하는 부하 테스트")
+    parser.add_argument("--users", type=int, default=10, help="가상 사용자 수")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="동시에 실행할 사용자 수 = 세션 스레드 수 (기본: 전체)")
+    parser.add_argument("--iterations", type=int, default=1, help="사용자마다 시나리오 반복 횟수")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SESSIONS), default=["voice", "run"])
+    parser.add_argument("--upload-seconds", type=float, default=10,
+                        help="홀수 번째 사용자가 업로드할 WAV 길이(초), 0이면 모두 음성 생성")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="측정 전에 차례로 실행할 사용자 수 (모델 로드, 작업자 시작, 캐시 채우기)")
+    parser.add_argument("--db", help="의견 저장 SQLite 파일 (기본: 임시 파일)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--max-p95-ms", type=float, help="어떤 상호작용의 p95가 이 값을 넘으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="ethic_load_") as tmp_dir:
+        # 페이지를 실행하기 전에 설정 (의견 저장소는 처음 import할 때 경로를 읽음)
+        os.environ["ETHIC_OPINION_DB"] = args.db or os.path.join(tmp_dir, "opinions.db")
+        os.environ["ETHIC_OPINION_TXT"] = os.path.join(tmp_dir, "data.txt")
+        report = run_load_test(args)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    failed = report["errors"] > 0
+    if args.max_p95_ms is not None:
+        failed |= any(s["p95"] * 1000 > args.max_p95_ms for s in report["stages"].values())
+    return 1 if failed else 0
+
+
+# 준비(추론 풀 시작, warmup 사용자)를 마친 뒤 사용자들을 concurrency개 스레드로 실행 -> 보고서
+def run_load_test(args):
+    import inference_pool
+    from model_config import DEFAULT_CONFIG
+    from streamlit.testing.v1.util import patch_config_options
+
+    concurrency = args.concurrency or args.users
+    upload = make_upload(args.upload_seconds) if args.upload_seconds > 0 else None
+    share_app_test_runtime()
+    # AppTest는 페이지 스크립트를 __main__ 모듈로 실행하므로, 끝나면 원래 __main__을 되돌립니다.
+    main_module = sys.modules["__main__"]
+    start = time.perf_counter()
+    # AppTest마다 설정(global.appTest)을 잠시 바꾸고 되돌리는데, 스레드들이 겹쳐 되돌려도 값이 같도록 전체 실행 동안 미리 바꿔 둠
+    with patch_config_options({"global.appTest": True}):
+        try:
+            # 추론 작업자는 spawn으로 __main__ 모듈을 다시 import 하므로, 페이지가 __main__이 되기 전에 먼저 띄움
+            pool = inference_pool.get_inference_pool()
+            pool.submit_features(np.zeros(DEFAULT_CONFIG["n_mfcc"])).result()
+            for user in range(args.warmup):
+                simulate_user(Recorder(), user, args.scenario, upload, 1)
+            print(f"준비 {time.perf_counter() - start:.1f}초 (세션 스레드 {concurrency}개, 추론 작업자 {pool.n_workers}개)",
+                  file=sys.stderr)
+
+            rec = Recorder()
+            monitor = ResourceMonitor()
+            monitor.start()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(concurrency, thread_name_prefix="load-test-user") as executor:
+                futures = [executor.submit(simulate_user, rec, user, args.scenario, upload, args.iterations)
+                           for user in range(args.users)]
+                # 사용자 실행 자체가 실패한 경우도 오류로 셈
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        rec.record_error("user", e)
+            wall = time.perf_counter() - start
+            resources = monitor.stop()
+        finally:
+            sys.modules["__main__"] = main_module
+            inference_pool.shutdown_inference_pool()
+
+    stages = rec.summary()
+    n_sessions = args.users * args.iterations * len(args.scenario)
+    return {
+        "users": args.users,
+        "concurrency": concurrency,
+        "iterations": args.iterations,
+        "scenarios": args.scenario,
+        "wall_seconds": wall,
+        "sessions_per_second": n_sessions / wall,
+        "interactions_per_second": sum(s["count"] for s in stages.values()) / wall,
+        "stages": stages,
+        "resources": resources,
+        "errors": rec.error_count(),
+        "error_types": dict(rec.error_types),
+        "error_messages": rec.messages,
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(main())
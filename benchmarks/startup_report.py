@@ -0,0 +1,59 @@
+# 앱 시작(import) 시간 보고서
+# python -X importtime 으로 페이지 스크립트를 실행하고 최상위 패키지별 import 시간을 정리합니다.
+# 사용법: python benchmarks/startup_report.py voice.py --top 15 --json startup.json
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# 페이지 스크립트를 Streamlit 없이(bare mode) 실행하면서 -X importtime 출력 수집
+def collect_import_times(script):
+    code = f"import runpy; runpy.run_path({script!r})"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+# 최상위 패키지별 누적 시간 (ms)
+def summarize(rows):
+    by_package = defaultdict(float)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us / 1000
+    total_ms = sum(by_package.values())
+    return total_ms, sorted(by_package.items(), key=lambda item: -item[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지 스크립트의 import 시간 보고서")
+    parser.add_argument("scripts", nargs="*", default=["voice.py"])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    report = {}
+    for script in args.scripts:
+        total_ms, packages = summarize(collect_import_times(script))
+        report[script] = {"total_ms": round(total_ms, 1),
+                          "packages": {name: round(ms, 1) for name, ms in packages}}
+        print(f"{script}: total import time {total_ms:.1f} ms")
+        for name, ms in packages[:args.top]:
+            print(f"  {name:<30} {ms:9.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# 학습된 모델을 numpy만으로 실행할 수 있는 작은 형식으로 내보내고 불러오는 모듈
+# 추론 프로세스는 sklearn/tensorflow 없이 이 모듈과 numpy만 import 하면 됩니다.
+# 사용법: python compact_model.py export-rf -o cache/models/rf_compact.npz
+#         python compact_model.py export-cnn -i cache/models/cnn.keras -o cache/models/cnn_compact.npz
+import argparse
+import json
+
+import numpy as np
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "sigmoid": lambda x: 1 / (1 + np.exp(-x)),
+}
+
+
+# 랜덤 포레스트를 평평한 노드 배열로 변환해 .npz로 저장
+# 모든 트리의 노드를 이어 붙이고, 자식 인덱스는 전체 배열 기준으로 바꿉니다.
+def export_forest(rf_model, path):
+    lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in rf_model.estimators_:
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        node_ids = np.arange(n_nodes)
+        is_leaf = tree.children_left == -1
+        # 잎 노드는 자기 자신을 가리키게 해서 깊이만큼 반복해도 그 자리에 머물도록 합니다.
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+        rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        value = tree.value[:, 0, :]
+        values.append(value / value.sum(axis=1, keepdims=True))
+        roots.append(offset)
+        offset += n_nodes
+        max_depth = max(max_depth, tree.max_depth)
+
+    np.savez_compressed(
+        path,
+        left=np.concatenate(lefts).astype(np.int32),
+        right=np.concatenate(rights).astype(np.int32),
+        feature=np.concatenate(features).astype(np.int32),
+        threshold=np.concatenate(thresholds),
+        value=np.concatenate(values).astype(np.float32),
+        roots=np.array(roots, dtype=np.int32),
+        classes=np.asarray(rf_model.classes_),
+        max_depth=np.array(max_depth),
+    )
+
+
+# numpy만 사용하는 랜덤 포레스트 추론기
+class CompactForest:
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.left = data["left"]
+            self.right = data["right"]
+            self.feature = data["feature"]
+            self.threshold = data["threshold"]
+            self.value = data["value"]
+            self.roots = data["roots"]
+            self.classes_ = data["classes"]
+            self.max_depth = int(data["max_depth"])
+
+    # 모든 샘플과 트리를 한꺼번에 한 단계씩 내려가는 방식 (트리 깊이만큼 반복)
+    def predict_proba(self, X):
+        # sklearn 트리는 입력을 float32로 바꾼 뒤 비교하므로 같은 방식으로 비교합니다.
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node].mean(axis=1, dtype=np.float64)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+# Keras Sequential CNN (build_cnn_model)의 가중치와 층 구성을 .npz로 저장
+# 지원하는 층: Conv2D(stride 1, valid), MaxPooling2D, Flatten, Dense
+def export_cnn(keras_model, path):
+    spec, arrays = [], {}
+    for i, layer in enumerate(keras_model.layers):
+        kind = layer.__class__.__name__
+        config = layer.get_config()
+        entry = {"kind": kind}
+        if kind in ("Conv2D", "Dense"):
+            kernel, bias = layer.get_weights()
+            arrays[f"kernel_{i}"] = kernel.astype(np.float32)
+            arrays[f"bias_{i}"] = bias.astype(np.float32)
+            entry.update(index=i, activation=config.get("activation", "linear"))
+            if kind == "Conv2D" and (tuple(config["strides"]) != (1, 1) or config["padding"] != "valid"):
+                raise ValueError(f"지원하지 않는 Conv2D 설정입니다: {config['strides']}, {config['padding']}")
+        elif kind == "MaxPooling2D":
+            entry.update(pool_size=list(config["pool_size"]), strides=list(config["strides"] or config["pool_size"]))
+        elif kind != "Flatten":
+            raise ValueError(f"지원하지 않는 층입니다: {kind}")
+        spec.append(entry)
+    np.savez_compressed(path, spec=np.array(json.dumps(spec)), **arrays)
+
+
+# numpy만 사용하는 CNN 추론기 (입력: (N, H, W, C), 출력: Keras predict와 같은 형태)
+class CompactCNN:
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.spec = json.loads(str(data["spec"]))
+            self.weights = {k: data[k] for k in data.files if k != "spec"}
+
+    def predict(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        for entry in self.spec:
+            kind = entry["kind"]
+            if kind == "Conv2D":
+                kernel = self.weights[f"kernel_{entry['index']}"]
+                kh, kw = kernel.shape[:2]
+                # (N, H', W', C, kh, kw) 창에 커널을 곱해 (N, H', W', out) 계산
+                windows = np.lib.stride_tricks.sliding_window_view(x, (kh, kw), axis=(1, 2))
+                x = np.einsum("nhwcij,ijco->nhwo", windows, kernel, optimize=True)
+                x = ACTIVATIONS[entry["activation"]](x + self.weights[f"bias_{entry['index']}"])
+            elif kind == "MaxPooling2D":
+                (ph, pw), (sh, sw) = entry["pool_size"], entry["strides"]
+                windows = np.lib.stride_tricks.sliding_window_view(x, (ph, pw), axis=(1, 2))[:, ::sh, ::sw]
+                x = windows.max(axis=(-2, -1))
+            elif kind == "Flatten":
+                x = x.reshape(x.shape[0], -1)
+            elif kind == "Dense":
+                x = x @ self.weights[f"kernel_{entry['index']}"] + self.weights[f"bias_{entry['index']}"]
+                x = ACTIVATIONS[entry["activation"]](x)
+        return x
+
+
+# 모델 레지스트리의 랜덤 포레스트를 내보내고 원래 모델과 결과 비교
+def _export_rf_command(args):
+    from audio_features import extract_mfcc_batch, generate_synthetic_audio
+    from model_registry import get_rf_model
+
+    rf_model = get_rf_model()
+    export_forest(rf_model, args.output)
+    compact = CompactForest(args.output)
+
+    rng = np.random.default_rng(123)
+    clips = np.stack([generate_synthetic_audio(is_real=bool(i % 2), rng=rng)[0] for i in range(args.check)])
+    X = extract_mfcc_batch(clips, 22050)
+    max_diff = np.abs(compact.predict_proba(X) - rf_model.predict_proba(X)).max()
+    print(f"{args.output} 저장, sklearn과의 확률 차이 최대 {max_diff:.2e}")
+    if max_diff > args.tolerance:
+        raise SystemExit("내보낸 모델의 결과가 원래 모델과 다릅니다.")
+
+
+# 내보낸 CNN과 Keras 모델의 출력을 무작위 입력(0~1 범위 이미지)으로 비교 -> 최대 차이
+# 차이가 tolerance보다 크면 SystemExit (numpy 추론기가 Keras와 다른 값을 내는 경우)
+def check_cnn_export(keras_model, compact, n=8, tolerance=1e-4, seed=123):
+    rng = np.random.default_rng(seed)
+    x = rng.random((n,) + tuple(keras_model.input_shape[1:]), dtype=np.float32)
+    max_diff = float(np.abs(compact.predict(x) - np.asarray(keras_model.predict(x, verbose=0))).max())
+    print(f"Keras와의 출력 차이 최대 {max_diff:.2e}")
+    if max_diff > tolerance:
+        raise SystemExit("내보낸 CNN의 결과가 Keras 모델과 다릅니다.")
+    return max_diff
+
+
+# 저장된 Keras CNN을 내보내고 원래 모델과 결과 비교 (tensorflow 필요)
+def _export_cnn_command(args):
+    import tensorflow as tf
+
+    keras_model = tf.keras.models.load_model(args.input)
+    export_cnn(keras_model, args.output)
+    print(f"{args.output} 저장")
+    check_cnn_export(keras_model, CompactCNN(args.output), n=args.check, tolerance=args.tolerance)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="학습된 모델을 numpy 추론 형식으로 내보내기")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rf = sub.add_parser("export-rf", help="랜덤 포레스트 내보내기")
+    rf.add_argument("-o", "--output", default="rf_compact.npz")
+    rf.add_argument("--check", type=int, default=200, help="비교에 사용할 합성 클립 수")
+    rf.add_argument("--tolerance", type=float, default=1e-6)
+    cnn = sub.add_parser("export-cnn", help="Keras CNN 내보내기 (train_cnn.py가 저장한 .keras 파일)")
+    cnn.add_argument("-i", "--input", required=True)
+    cnn.add_argument("-o", "--output", default="cnn_compact.npz")
+    cnn.add_argument("--check", type=int, default=8, help="비교에 사용할 무작위 입력 수")
+    cnn.add_argument("--tolerance", type=float, default=1e-4)
+    args = parser.parse_args(argv)
+    if args.command == "export-rf":
+        _export_rf_command(args)
+    elif args.command == "export-cnn":
+        _export_cnn_command(args)
+
+
+if __name__ == "__main__":
+    main()
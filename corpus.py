@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from audio_features import generate_synthetic_audio
+
+# 합성 학습 데이터를 저장하는 폴더 (환경 변수로 변경 가능)
+CORPUS_DIR = os.environ.get(
+    "ETHIC_CORPUS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "corpus"),
+)
+
+# generate_synthetic_audio의 동작이 바뀌면 이 값을 올려서 저장된 데이터를 무효화합니다.
+GENERATOR_VERSION = 2
+
+# 기본 생성 설정
+DEFAULT_CORPUS = {
+    "n_pairs": 50,
+    "duration": 3,
+    "sr": 22050,
+    "noise_level": 0.1,
+    "seed": 42,
+}
+
+# 프로세스 안에서 공유하는 memmap 목록
+_corpora = {}
+_lock = threading.Lock()
+
+
+# 생성 파라미터로부터 데이터셋 키 생성
+def corpus_key(config):
+    payload = dict(config, generator_version=GENERATOR_VERSION)
+    raw = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+# 데이터셋 파일 경로 (클립, 라벨, 메타데이터)
+def corpus_paths(key):
+    base = os.path.join(CORPUS_DIR, f"synthetic_{key}")
+    return f"{base}.npy", f"{base}.labels.npy", f"{base}.json"
+
+
+# 진짜/가짜 클립을 번갈아 생성하여 float32 .npy 파일로 저장
+# 클립은 한 개씩 memmap에 바로 기록하므로 전체 데이터를 메모리에 올리지 않습니다.
+def build_corpus(config):
+    key = corpus_key(config)
+    clips_path, labels_path, meta_path = corpus_paths(key)
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+
+    rng = np.random.default_rng(config["seed"])
+    n_samples = int(config["sr"] * config["duration"])
+    n_clips = 2 * config["n_pairs"]
+
+    tmp_suffix = f".{os.getpid()}.tmp"
+    clips = np.lib.format.open_memmap(clips_path + tmp_suffix, mode="w+", dtype=np.float32,
+                                      shape=(n_clips, n_samples))
+    labels = np.empty(n_clips, dtype=np.int8)
+    for i in range(config["n_pairs"]):
+        for j, is_real in enumerate((True, False)):
+            audio, _ = generate_synthetic_audio(is_real=is_real, duration=config["duration"], sr=config["sr"],
+                                                rng=rng, noise_level=config["noise_level"], dtype=np.float32)
+            clips[2 * i + j] = audio
+            labels[2 * i + j] = 1 if is_real else 0
+    clips.flush()
+    del clips
+
+    with open(labels_path + tmp_suffix, "wb") as f:
+        np.save(f, labels)
+    with open(meta_path + tmp_suffix, "w", encoding="utf-8") as f:
+        json.dump(dict(config, generator_version=GENERATOR_VERSION, n_clips=n_clips, n_samples=n_samples), f)
+
+    # 라벨/메타데이터를 먼저 옮기고 클립 파일은 마지막에 옮겨서, 클립 파일이 있으면 데이터셋이 완성된 상태가 되도록 합니다.
+    os.replace(labels_path + tmp_suffix, labels_path)
+    os.replace(meta_path + tmp_suffix, meta_path)
+    os.replace(clips_path + tmp_suffix, clips_path)
+    return key
+
+
+# 합성 데이터셋 가져오기 (없으면 생성)
+# 반환되는 clips는 읽기 전용 memmap이므로 여러 세션이 같은 페이지를 공유합니다.
+def load_corpus(**overrides):
+    config = dict(DEFAULT_CORPUS, **overrides)
+    key = corpus_key(config)
+    corpus = _corpora.get(key)
+    if corpus is not None:
+        return corpus
+
+    with _lock:
+        corpus = _corpora.get(key)
+        if corpus is not None:
+            return corpus
+
+        clips_path, labels_path, _ = corpus_paths(key)
+        if not (os.path.exists(clips_path) and os.path.exists(labels_path)):
+            build_corpus(config)
+        clips = np.load(clips_path, mmap_mode="r")
+        labels = np.load(labels_path)
+        corpus = (clips, labels, config["sr"])
+        _corpora[key] = corpus
+        return corpus
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from audio_features import extract_mfcc, extract_spectrogram
+
+# 캐시 최대 크기 (MB, 환경 변수로 변경 가능)
+CACHE_BUDGET_MB = int(os.environ.get("ETHIC_FEATURE_CACHE_MB", "256"))
+
+
+# 바이트 크기 제한이 있는 LRU 캐시 (모든 세션이 공유하므로 잠금 사용)
+class ByteLRUCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, nbytes):
+        # 예산보다 큰 값은 저장하지 않음
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._items[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            # 오래 사용하지 않은 항목부터 제거
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._items.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# 프로세스 전체에서 공유하는 캐시
+feature_cache = ByteLRUCache(CACHE_BUDGET_MB * 1024 * 1024)
+
+
+# 오디오 내용과 샘플레이트로 해시 생성 (같은 음성이면 세션이 달라도 같은 키)
+def audio_hash(audio, sr):
+    audio = np.ascontiguousarray(audio)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{audio.dtype.str}|{audio.shape}|{sr}".encode("utf-8"))
+    h.update(audio.data)
+    return h.hexdigest()
+
+
+# 값의 메모리 크기 (numpy 배열 또는 bytes)
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return len(value)
+
+
+# 캐시에 있으면 그대로, 없으면 compute()로 계산 후 저장
+# 캐시된 배열은 여러 세션이 공유하므로 읽기 전용으로 만듭니다.
+def get_or_compute(kind, audio, sr, compute, **params):
+    key = (kind, audio_hash(audio, sr), tuple(sorted(params.items())))
+    value = feature_cache.get(key)
+    if value is None:
+        value = compute()
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+        feature_cache.put(key, value, _nbytes(value))
+    return value
+
+
+# 캐시를 사용하는 스펙트로그램 추출
+def cached_spectrogram(audio, sr, **params):
+    return get_or_compute("spectrogram", audio, sr, lambda: extract_spectrogram(audio, sr, **params), **params)
+
+
+# 캐시를 사용하는 MFCC 추출
+def cached_mfcc(audio, sr, **params):
+    return get_or_compute("mfcc", audio, sr, lambda: extract_mfcc(audio, sr, **params), **params)
+
+
+# 캐시를 사용하는 그림(PNG/WebP bytes) 생성, render()는 이미지 bytes를 반환해야 합니다.
+def cached_figure(name, audio, sr, render, **params):
+    return get_or_compute(f"figure:{name}", audio, sr, render, **params)
@@ -0,0 +1,111 @@
+# MFCC / Mel 스펙트로그램 계산에 쓰는 선형 연산자 (Mel 필터 뱅크, DCT 행렬)
+# librosa의 기본값과 같은 정의를 사용합니다: Slaney Mel 척도, 면적 정규화된 삼각 필터, 직교 정규화 DCT-II.
+# 연산자는 파라미터별로 한 번만 만들어 크기가 제한된 캐시에 두고, 모든 세션/스레드가 읽기 전용으로 공유합니다.
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# 파라미터 조합별로 보관하는 연산자 수 (환경 변수로 변경 가능)
+OPERATOR_CACHE_SIZE = int(os.environ.get("ETHIC_OPERATOR_CACHE_SIZE", "16"))
+
+# dB 변환 시 0을 피하기 위한 최솟값 (librosa.power_to_db의 amin과 같음)
+AMIN = 1e-10
+
+# Slaney Mel 척도: 1000 Hz 아래는 선형, 위는 로그
+_F_SP = 200.0 / 3
+_MIN_LOG_HZ = 1000.0
+_MIN_LOG_MEL = _MIN_LOG_HZ / _F_SP
+_LOG_STEP = np.log(6.4) / 27.0
+
+
+# Hz -> Mel (Slaney)
+def hz_to_mel(freqs):
+    freqs = np.asarray(freqs, dtype=np.float64)
+    mels = freqs / _F_SP
+    log_part = freqs >= _MIN_LOG_HZ
+    mels = np.where(log_part, _MIN_LOG_MEL + np.log(np.maximum(freqs, _MIN_LOG_HZ) / _MIN_LOG_HZ) / _LOG_STEP, mels)
+    return mels
+
+
+# Mel -> Hz (Slaney)
+def mel_to_hz(mels):
+    mels = np.asarray(mels, dtype=np.float64)
+    freqs = mels * _F_SP
+    log_part = mels >= _MIN_LOG_MEL
+    return np.where(log_part, _MIN_LOG_HZ * np.exp(_LOG_STEP * (mels - _MIN_LOG_MEL)), freqs)
+
+
+# Mel 필터 뱅크 (n_mels, n_fft // 2 + 1), C 연속 float32, 읽기 전용
+# Mel 축에서 같은 간격인 삼각 필터를 만들고, 각 필터의 면적이 같도록 대역폭으로 나눕니다 (librosa.filters.mel과 동일).
+@lru_cache(maxsize=OPERATOR_CACHE_SIZE)
+def mel_filter_bank(sr, n_fft, n_mels, fmin=0.0, fmax=None):
+    if fmax is None:
+        fmax = sr / 2
+    fft_freqs = np.fft.rfftfreq(n_fft, 1.0 / sr)
+    mel_freqs = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+
+    bandwidths = np.diff(mel_freqs)
+    ramps = mel_freqs[:, None] - fft_freqs[None, :]
+    # 각 필터의 올라가는 변과 내려가는 변 중 작은 쪽
+    rising = -ramps[:-2] / bandwidths[:-1, None]
+    falling = ramps[2:] / bandwidths[1:, None]
+    weights = np.maximum(0, np.minimum(rising, falling))
+    weights *= (2.0 / (mel_freqs[2:] - mel_freqs[:-2]))[:, None]
+
+    weights = np.ascontiguousarray(weights, dtype=np.float32)
+    weights.setflags(write=False)
+    return weights
+
+
+# 직교 정규화 DCT-II 행렬 (n_mfcc, n_mels), C 연속 float32, 읽기 전용
+# scipy.fft.dct(type=2, norm='ortho')의 앞 n_mfcc개 계수와 같습니다.
+@lru_cache(maxsize=OPERATOR_CACHE_SIZE)
+def dct_matrix(n_mfcc, n_mels):
+    k = np.arange(n_mfcc)[:, None]
+    n = np.arange(n_mels)[None, :]
+    basis = np.sqrt(2.0 / n_mels) * np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels))
+    basis[0] /= np.sqrt(2.0)
+    basis = np.ascontiguousarray(basis, dtype=np.float32)
+    basis.setflags(write=False)
+    return basis
+
+
+# 파워 스펙트로그램 (..., n_freqs, n_frames) -> dB Mel 스펙트로그램 (..., n_mels, n_frames)
+# Mel 필터 뱅크 행렬곱 한 번으로 MFCC와 Mel 스펙트로그램 경로가 같이 사용합니다.
+def mel_spectrogram_db(power, sr, n_fft, n_mels):
+    mel = np.matmul(mel_filter_bank(sr, n_fft, n_mels), power)
+    return power_to_db(mel, out=mel)
+
+
+# 파워 -> dB (10 * log10(max(x, AMIN)), librosa.power_to_db(ref=1.0, top_db=None)과 같음)
+# 스트리밍에서는 클립 전체의 최댓값을 미리 알 수 없으므로 top_db로 자르지 않습니다.
+def power_to_db(power, out=None):
+    out = np.maximum(power, AMIN, out=out)
+    np.log10(out, out=out)
+    out *= 10
+    return out
+
+
+# 프레임별 dB Mel 에너지의 평균 (..., n_mels) -> MFCC (..., n_mfcc)
+# DCT는 선형이므로 프레임 평균을 먼저 구한 뒤 곱해도 프레임별 MFCC의 평균과 같습니다.
+def mfcc_from_mean_db(mean_db, n_mfcc):
+    return mean_db @ dct_matrix(n_mfcc, mean_db.shape[-1]).T
+
+
+# 프레임별 특성 (n_frames, n_features)의 시간 변화량 (delta, librosa.feature.delta와 같은 회귀식)
+# 양 끝은 첫/마지막 프레임을 반복해서 채웁니다. width는 홀수 (기본 9: 앞뒤 4프레임).
+def delta_coefficients(frames, width=9):
+    half = width // 2
+    padded = np.pad(frames, [(half, half)] + [(0, 0)] * (frames.ndim - 1), mode="edge")
+    return delta_from_padded(padded, half)
+
+
+# 앞뒤로 half개씩 문맥 프레임이 붙은 배열에서 가운데 프레임들의 delta 계산 (스트리밍에서도 사용)
+def delta_from_padded(padded, half):
+    n_frames = len(padded) - 2 * half
+    out = np.zeros((n_frames,) + padded.shape[1:], dtype=padded.dtype)
+    for n in range(1, half + 1):
+        out += n * (padded[half + n:half + n + n_frames] - padded[half - n:half - n + n_frames])
+    out /= 2 * sum(n * n for n in range(1, half + 1))
+    return out
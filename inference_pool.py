@@ -0,0 +1,137 @@
+# 분류 작업을 별도 프로세스에서 실행하는 작업자 풀
+# Streamlit 스크립트 스레드는 작업을 넣고 Future만 받아서 기다리므로 화면이 멈추지 않고,
+# 여러 세션의 계산이 한 프로세스의 GIL을 두고 경쟁하지 않습니다.
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from audio_features import extract_mfcc
+from compact_model import CompactForest
+from ingest import MODEL_SR, resample
+from micro_batch import MicroBatcher
+from model_config import DEFAULT_CONFIG, compact_rf_path
+
+# 작업자 프로세스 수, 한 묶음의 최대 요청 수, 요청을 모으는 시간(ms) (환경 변수로 변경 가능)
+N_WORKERS = int(os.environ.get("ETHIC_INFERENCE_WORKERS", str(os.cpu_count() or 1)))
+MAX_BATCH = int(os.environ.get("ETHIC_INFERENCE_MAX_BATCH", "32"))
+BATCH_WINDOW_MS = float(os.environ.get("ETHIC_INFERENCE_BATCH_WINDOW_MS", "5"))
+
+# 작업자 프로세스마다 한 번 불러오는 모델 (numpy만 사용하는 CompactForest, sklearn은 import 하지 않음)
+_worker_model = None
+
+
+def _init_worker(model_path):
+    global _worker_model
+    _worker_model = CompactForest(model_path)
+
+
+# 작업 하나의 MFCC (features 작업은 그대로, audio 작업은 모노, 모델 샘플레이트로 변환한 뒤 추출)
+def _job_features(job):
+    kind, payload, sr = job
+    if kind == "features":
+        return np.asarray(payload, dtype=np.float64)
+    audio, sr = resample(payload, sr, MODEL_SR)
+    return extract_mfcc(audio, sr, n_mfcc=DEFAULT_CONFIG["n_mfcc"], n_fft=DEFAULT_CONFIG["n_fft"],
+                        hop_length=DEFAULT_CONFIG["hop_length"], n_mels=DEFAULT_CONFIG["n_mels"])
+
+
+# 작업자 프로세스에서 실행: 묶음의 특성을 모아 predict_proba를 한 번만 호출
+# 결과: 작업별 진짜 확률 또는 예외 객체
+def _score_batch(jobs):
+    results = [None] * len(jobs)
+    features, rows = [], []
+    for i, job in enumerate(jobs):
+        try:
+            features.append(_job_features(job))
+            rows.append(i)
+        except Exception as e:
+            results[i] = e
+    if features:
+        real_index = list(_worker_model.classes_).index(1)
+        proba = _worker_model.predict_proba(np.stack(features))[:, real_index]
+        for i, p in zip(rows, proba):
+            results[i] = float(p)
+    return results
+
+
+# 요청을 모아서 작업자 프로세스에 보내는 풀
+# 요청은 MicroBatcher가 batch_window_ms 동안(최대 max_batch개) 모은 뒤 한 묶음으로 작업자에게 보냅니다.
+class InferencePool:
+    def __init__(self, n_workers=N_WORKERS, max_batch=MAX_BATCH, batch_window_ms=BATCH_WINDOW_MS):
+        # 작업자가 불러올 numpy 형식 모델이 없으면 먼저 학습/내보내기 (이때만 sklearn 사용)
+        self.model_path = compact_rf_path()
+        if not os.path.exists(self.model_path):
+            from model_registry import export_compact_rf
+            export_compact_rf()
+        self.n_workers = n_workers
+        self.restarts = 0
+        self._executor = self._new_executor()
+        self._batcher = MicroBatcher(self._send, max_batch=max_batch, max_wait_ms=batch_window_ms,
+                                     name="inference-dispatch")
+
+    # 음성 분류 요청 (결과: 진짜 확률을 담는 Future)
+    def submit_audio(self, audio, sr):
+        return self._batcher.submit(("audio", audio, sr))
+
+    # 이미 추출한 MFCC로 분류 요청
+    def submit_features(self, mfcc):
+        return self._batcher.submit(("features", mfcc, None))
+
+    # 아직 처리되지 않은 요청 수 (화면에 대기 상태를 보여줄 때 사용)
+    def pending(self):
+        return self._batcher.pending()
+
+    # p50/p99 지연 시간과 묶음 크기 분포
+    def stats(self):
+        return self._batcher.stats.snapshot()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker, initargs=(self.model_path,),
+                                   mp_context=multiprocessing.get_context("spawn"))
+
+    # 묶음 하나를 작업자 프로세스에 보내고 결과 Future를 반환 (계산을 기다리지 않음)
+    # 작업자가 비정상 종료되어 풀이 망가졌으면 새 작업자 풀을 만들고 한 번 더 시도합니다.
+    # (망가질 때 처리 중이던 묶음의 요청들은 BrokenProcessPool 예외로 끝납니다.)
+    def _send(self, jobs):
+        try:
+            return self._executor.submit(_score_batch, jobs)
+        except BrokenProcessPool:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            self.restarts += 1
+            return self._executor.submit(_score_batch, jobs)
+
+    def shutdown(self):
+        self._batcher.close()
+        self._executor.shutdown()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 작업자 풀
+def get_inference_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = InferencePool()
+        return _pool
+
+
+# 이미 만들어진 공유 작업자 풀 (아직 없으면 None, 작업자를 새로 띄우지 않음)
+def current_inference_pool():
+    return _pool
+
+
+# 공유 작업자 풀 종료 (다음 get_inference_pool 호출 때 새로 만듦)
+def shutdown_inference_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
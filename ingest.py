@@ -0,0 +1,136 @@
+# 업로드/파일 음성을 모델 입력 형식(모노, MODEL_SR Hz)으로 맞추는 입력 단계
+# 여러 채널은 평균으로 합치고, 샘플레이트가 다르면 polyphase 필터(scipy.signal.resample_poly)로 변환합니다.
+# 긴 파일은 블록 단위로 읽고 변환하므로 원본 전체를 float로 메모리에 올리지 않습니다.
+import os
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+import soundfile as sf
+from scipy.signal import firwin, resample_poly
+
+from audio_features import AUDIO_DTYPE
+from corpus import DEFAULT_CORPUS
+from instrumentation import timed
+
+# 모델이 학습된 샘플레이트 (합성 학습 데이터와 같음)
+MODEL_SR = DEFAULT_CORPUS["sr"]
+
+# 파일을 읽고 변환하는 블록 길이(초) (환경 변수로 변경 가능)
+CHUNK_SECONDS = float(os.environ.get("ETHIC_INGEST_CHUNK_SECONDS", "30"))
+
+
+# 샘플레이트 변환 비율 (up / down, 기약분수)
+def resample_ratio(sr, target_sr):
+    g = gcd(int(sr), int(target_sr))
+    return int(target_sr) // g, int(sr) // g
+
+
+# resample_poly 기본값과 같은 저역 통과 FIR 필터 (Kaiser 창, beta 5)
+# 설계 비용이 크므로 (up, down, dtype)별로 한 번만 만들고 읽기 전용으로 공유합니다.
+@lru_cache(maxsize=16)
+def resample_filter(up, down, dtype=np.float32):
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    h = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)).astype(dtype)
+    h.setflags(write=False)
+    return h
+
+
+# 여러 채널 음성을 모노로 합침 ((n_samples,) 또는 (n_samples, n_channels))
+# 채널 평균을 행렬-벡터 곱으로 계산합니다 (mean(axis=1)보다 훨씬 빠름).
+def to_mono(audio):
+    audio = np.asarray(audio, dtype=AUDIO_DTYPE)
+    if audio.ndim > 1:
+        audio = audio @ np.full(audio.shape[1], 1 / audio.shape[1], dtype=AUDIO_DTYPE)
+    return audio
+
+
+# 블록 단위로 들어오는 모노 음성의 샘플레이트를 변환하는 클래스
+# 블록 사이의 필터 문맥(앞뒤 샘플)을 넘겨 주므로, 결과를 이어 붙이면 전체 신호를 한 번에 resample_poly한 결과와 같습니다.
+class ChunkResampler:
+    def __init__(self, sr, target_sr=MODEL_SR):
+        self.up, self.down = resample_ratio(sr, target_sr)
+        self.passthrough = self.up == self.down
+        self._buf = np.zeros(0, dtype=AUDIO_DTYPE)
+        self._left = 0  # _buf 앞쪽에 있는, 이미 출력한 문맥 샘플 수
+        if self.passthrough:
+            return
+        self._filter = resample_filter(self.up, self.down, AUDIO_DTYPE)
+        # 필터 절반 길이를 입력 샘플 수로 바꾸고 down의 배수로 올림 (출력 위치가 블록 경계와 맞도록)
+        half_len = (len(self._filter) - 1) // 2
+        context = -(-half_len // self.up) + 1
+        self._context = -(-context // self.down) * self.down
+
+    # 새 블록을 넣고, 오른쪽 문맥까지 확보된 구간의 변환 결과를 반환
+    def push(self, block):
+        block = np.asarray(block, dtype=AUDIO_DTYPE)
+        if self.passthrough:
+            return block
+        self._buf = np.concatenate([self._buf, block])
+        ready = (len(self._buf) - self._left - self._context) // self.down * self.down
+        if ready <= 0:
+            return np.zeros(0, dtype=AUDIO_DTYPE)
+        end = self._left + ready
+        out = self._resample(self._buf[:end + self._context], self._left, end)
+        # 다음 구간의 왼쪽 문맥으로 쓸 샘플만 남김 (신호 시작 부분에서는 있는 만큼만)
+        keep_from = max(0, end - self._context)
+        self._buf = self._buf[keep_from:]
+        self._left = end - keep_from
+        return out
+
+    # 남은 샘플 변환 (신호의 끝, 오른쪽은 0으로 채운 것으로 봄)
+    def flush(self):
+        if self.passthrough or len(self._buf) <= self._left:
+            return np.zeros(0, dtype=AUDIO_DTYPE)
+        out = self._resample(self._buf, self._left, len(self._buf))
+        self._buf = np.zeros(0, dtype=AUDIO_DTYPE)
+        self._left = 0
+        return out
+
+    # segment를 변환하고 입력 [start, end) 구간에 해당하는 출력만 잘라냄 (start는 down의 배수)
+    def _resample(self, segment, start, end):
+        y = resample_poly(segment, self.up, self.down, window=self._filter)
+        first = start * self.up // self.down
+        last = -(-end * self.up // self.down)
+        return y[first:last].astype(AUDIO_DTYPE, copy=False)
+
+
+# 메모리에 있는 음성을 모노, target_sr로 변환 -> (audio, target_sr)
+def resample(audio, sr, target_sr=MODEL_SR, chunk_seconds=CHUNK_SECONDS):
+    audio = to_mono(audio)
+    resampler = ChunkResampler(sr, target_sr)
+    if resampler.passthrough:
+        return audio, target_sr
+    block = max(1, int(sr * chunk_seconds))
+    parts = [resampler.push(audio[start:start + block]) for start in range(0, len(audio), block)]
+    parts.append(resampler.flush())
+    return np.concatenate(parts), target_sr
+
+
+# sr Hz 블록들을 모노, target_sr Hz 블록들로 바꿔 차례로 내보내는 제너레이터 (실시간 입력에도 사용)
+def resample_blocks(blocks, sr, target_sr=MODEL_SR):
+    resampler = ChunkResampler(sr, target_sr)
+    for block in blocks:
+        out = resampler.push(to_mono(block))
+        if len(out):
+            yield out
+    tail = resampler.flush()
+    if len(tail):
+        yield tail
+
+
+# 음성 파일을 블록 단위로 읽어 모노, target_sr로 변환한 블록을 차례로 내보내는 제너레이터
+def iter_audio(file, target_sr=MODEL_SR, chunk_seconds=CHUNK_SECONDS):
+    with sf.SoundFile(file) as f:
+        blocksize = max(1, int(f.samplerate * chunk_seconds))
+        blocks = f.blocks(blocksize=blocksize, dtype=AUDIO_DTYPE.name, always_2d=True)
+        yield from resample_blocks(blocks, f.samplerate, target_sr)
+
+
+# 음성 파일 전체를 모노, target_sr로 읽기 -> (audio, target_sr)
+@timed("load_audio")
+def load_audio(file, target_sr=MODEL_SR, chunk_seconds=CHUNK_SECONDS):
+    parts = list(iter_audio(file, target_sr, chunk_seconds))
+    audio = np.concatenate(parts) if parts else np.zeros(0, dtype=AUDIO_DTYPE)
+    return audio, target_sr
@@ -0,0 +1,192 @@
+# 처리 단계별 실행 시간 계측 (프로세스 단위 히스토그램, Prometheus 텍스트 형식 내보내기)
+# 사용법:
+#   with span("extract_mfcc"): ...       # 코드 구간 계측
+#   @timed("extract_mfcc")               # 함수 계측
+# ETHIC_METRICS=0이면 계측을 끕니다. 이때 span()은 공유된 빈 컨텍스트를 돌려주고 timed는 함수를 그대로 반환합니다.
+import contextlib
+import os
+import threading
+import time
+from functools import wraps
+
+# 계측 사용 여부, Prometheus 파일 경로, HTTP 포트 (환경 변수로 변경 가능)
+ENABLED = os.environ.get("ETHIC_METRICS", "1") != "0"
+METRICS_FILE = os.environ.get(
+    "ETHIC_METRICS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "metrics.prom"),
+)
+METRICS_PORT = int(os.environ.get("ETHIC_METRICS_PORT", "0"))
+
+# 히스토그램 구간 상한(초), Prometheus 기본값에 특성 추출처럼 짧은 단계를 위한 ms 단위 구간을 더함
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = contextlib.nullcontext()
+
+
+# 한 단계의 실행 시간 히스토그램
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(self.buckets) and seconds > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    # 구간 안에서 선형 보간한 분위수(초)
+    def quantile(self, q):
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= target and n:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                # 관측된 최댓값보다 크게 추정하지 않음
+                return min(lower + (upper - lower) * (target - seen) / n, self.max)
+            seen += n
+        return self.max
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+# 실행 시간 한 번 기록
+def observe(stage, seconds):
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = Histogram()
+        hist.observe(seconds)
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+# 코드 구간 계측 컨텍스트
+def span(stage):
+    if not ENABLED:
+        return _NOOP
+    return _Span(stage)
+
+
+# 함수 계측 데코레이터 (계측을 끄면 원래 함수를 그대로 반환)
+def timed(stage):
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(stage, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+# 단계별 요약 (횟수, 합계/평균/p50/p95/최대, 단위: 초)
+def snapshot():
+    with _lock:
+        items = sorted(_histograms.items())
+        return {
+            stage: {
+                "count": hist.count,
+                "sum": hist.sum,
+                "mean": hist.sum / hist.count,
+                "p50": hist.quantile(0.5),
+                "p95": hist.quantile(0.95),
+                "max": hist.max,
+            }
+            for stage, hist in items
+        }
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+# Prometheus 텍스트 형식 (누적 버킷, _sum, _count)
+def prometheus_text():
+    lines = [
+        "# HELP ethic_stage_seconds Time spent in each processing stage.",
+        "# TYPE ethic_stage_seconds histogram",
+    ]
+    with _lock:
+        for stage, hist in sorted(_histograms.items()):
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for le, n in zip(list(hist.buckets) + ["+Inf"], hist.counts):
+                cumulative += n
+                lines.append(f'ethic_stage_seconds_bucket{{stage="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'ethic_stage_seconds_sum{{stage="{label}"}} {hist.sum:.6f}')
+            lines.append(f'ethic_stage_seconds_count{{stage="{label}"}} {hist.count}')
+    return "\n".join(lines) + "\n"
+
+
+# Prometheus 텍스트를 파일로 저장 (node_exporter textfile collector 등에서 읽을 수 있도록 원자적으로 교체)
+def write_prometheus(path=METRICS_FILE):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+    return path
+
+
+_server = None
+
+
+# /metrics 엔드포인트를 제공하는 HTTP 서버를 (프로세스당 한 번) 백그라운드 스레드로 시작
+# http.server는 포트가 설정된 경우에만 불러옵니다 (앱 시작 시간에 영향 없음).
+def start_http_server(port=METRICS_PORT, host="127.0.0.1"):
+    global _server
+    if not port:
+        return None
+    with _lock:
+        if _server is None:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = prometheus_text().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass  # 요청마다 로그를 남기지 않음
+
+            _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server
@@ -0,0 +1,55 @@
+import importlib
+import threading
+import time
+import types
+
+# 모듈별로 처음 불러올 때 걸린 시간 (초)
+IMPORT_TIMES = {}
+
+# lazy_module로 불러오기를 미룬 모듈 이름 (처음 등록한 순서, 관리자 패널에 표시)
+DEFERRED = []
+
+_lock = threading.RLock()
+
+
+# 모듈을 한 번만 불러오고 걸린 시간을 기록
+def load_module(name):
+    with _lock:
+        if name not in IMPORT_TIMES:
+            start = time.perf_counter()
+            module = importlib.import_module(name)
+            IMPORT_TIMES[name] = time.perf_counter() - start
+            return module
+    return importlib.import_module(name)
+
+
+# 속성에 처음 접근할 때 실제 모듈을 불러오는 대리 모듈
+# 예: tf = lazy_module("tensorflow") -> tf.keras 를 처음 사용할 때 tensorflow를 import
+class LazyModule(types.ModuleType):
+    def __init__(self, name):
+        super().__init__(name)
+        self._lazy_module = None
+
+    def _load(self):
+        module = self._lazy_module
+        if module is None:
+            module = load_module(self.__name__)
+            self._lazy_module = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_module(name):
+    with _lock:
+        if name not in DEFERRED:
+            DEFERRED.append(name)
+    return LazyModule(name)
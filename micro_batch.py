@@ -0,0 +1,132 @@
+# 동시에 들어오는 요청을 짧은 시간 동안 모아서 한 번에 처리하는 묶음(micro-batch) 처리기
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+# 통계용으로 보관하는 최근 지연 시간 개수
+LATENCY_WINDOW = 10000
+
+
+# 요청 지연 시간과 묶음 크기 통계
+class BatchStats:
+    def __init__(self, window=LATENCY_WINDOW):
+        self._latencies = deque(maxlen=window)
+        self._batch_sizes = Counter()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+
+    def record_batch(self, size):
+        with self._lock:
+            self._batch_sizes[size] += 1
+            self.batches += 1
+
+    def record_latency(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds * 1000)
+            self.requests += 1
+
+    # p50/p99 지연 시간(ms)과 묶음 크기 분포
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            batch_sizes = dict(sorted(self._batch_sizes.items()))
+            requests, batches = self.requests, self.batches
+
+        def percentile(q):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(q / 100 * len(latencies)))]
+
+        return {
+            "requests": requests,
+            "batches": batches,
+            "mean_batch_size": requests / batches if batches else None,
+            "latency_ms": {"p50": percentile(50), "p99": percentile(99), "max": latencies[-1] if latencies else None},
+            "batch_size_hist": batch_sizes,
+        }
+
+
+# 묶음 처리기
+# handler(items)는 결과 리스트를 반환하거나, 결과 리스트를 담은 Future를 반환할 수 있습니다.
+# (Future를 반환하면 계산이 끝나기를 기다리지 않고 다음 묶음을 모읍니다.)
+# 결과 리스트의 원소가 예외 객체이면 해당 요청의 Future에 예외로 전달합니다.
+class MicroBatcher:
+    def __init__(self, handler, max_batch=32, max_wait_ms=5.0, name="micro-batch"):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.stats = BatchStats()
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    # 요청 하나 추가 (결과: Future)
+    def submit(self, item):
+        future = Future()
+        self._requests.put((item, future, time.perf_counter()))
+        return future
+
+    # 아직 묶음으로 보내지 않은 요청 수
+    def pending(self):
+        return self._requests.qsize()
+
+    def close(self):
+        self._requests.put(None)
+        self._thread.join()
+
+    # 첫 요청이 오면 max_wait 동안(또는 max_batch개가 찰 때까지) 더 모은 뒤 처리
+    def _run(self):
+        while True:
+            first = self._requests.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            closing = False
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                try:
+                    item = self._requests.get(timeout=timeout) if timeout > 0 else self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            self._process(batch)
+            if closing:
+                return
+
+    def _process(self, batch):
+        # 이미 취소된 요청은 처리하지 않음
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self.stats.record_batch(len(batch))
+        try:
+            results = self.handler([item for item, _, _ in batch])
+        except Exception as e:
+            self._resolve(batch, [e] * len(batch))
+            return
+
+        if isinstance(results, Future):
+            def on_done(done):
+                try:
+                    self._resolve(batch, done.result())
+                except Exception as e:
+                    self._resolve(batch, [e] * len(batch))
+            results.add_done_callback(on_done)
+        else:
+            self._resolve(batch, results)
+
+    def _resolve(self, batch, results):
+        now = time.perf_counter()
+        for (_, future, submitted), result in zip(batch, results):
+            self.stats.record_latency(now - submitted)
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,37 @@
+# 모델 학습 설정과 저장 위치
+# sklearn/tensorflow 없이 import 할 수 있어서, 저장된 모델만 불러오는 추론 프로세스도 이 모듈을 사용합니다.
+import hashlib
+import json
+import os
+
+# 학습된 모델을 저장하는 폴더 (환경 변수로 변경 가능)
+MODEL_DIR = os.environ.get(
+    "ETHIC_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "models"),
+)
+
+# 특성 추출 방식이 바뀌면 이 값을 올려서 저장된 모델을 무효화합니다.
+FEATURE_VERSION = 4
+
+# 기본 학습 설정 (voice.py에서 쓰던 값과 동일)
+DEFAULT_CONFIG = {
+    "n_mfcc": 13,
+    "n_fft": 2048,
+    "hop_length": 512,
+    "n_mels": 40,
+    "n_pairs": 50,
+    "n_estimators": 100,
+    "seed": 42,
+}
+
+
+# 학습 설정으로부터 모델 버전 키 생성 (extra: 라이브러리 버전처럼 키에 함께 넣을 값)
+def config_key(config, **extra):
+    payload = dict(config, feature_version=FEATURE_VERSION, **extra)
+    raw = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+# numpy 추론 형식(compact_model.CompactForest)으로 내보낸 랜덤 포레스트 파일 경로
+def compact_rf_path(config=DEFAULT_CONFIG):
+    return os.path.join(MODEL_DIR, f"rf_compact_{config_key(config)}.npz")
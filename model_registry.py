@@ -0,0 +1,83 @@
+import os
+import threading
+
+import joblib
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+
+from audio_features import extract_mfcc_batch
+from compact_model import export_forest
+from corpus import load_corpus
+from instrumentation import span
+from model_config import DEFAULT_CONFIG, MODEL_DIR, compact_rf_path, config_key
+
+# 프로세스 안에서 공유하는 모델 저장소 (모든 세션이 같은 모델을 사용)
+_models = {}
+_lock = threading.Lock()
+
+
+# 학습 설정으로부터 모델 버전 키 생성
+def model_key(config):
+    return config_key(config, sklearn=sklearn.__version__)
+
+
+# 합성 음성으로 랜덤 포레스트 학습
+def train_rf_model(config):
+    feature_kwargs = {k: config[k] for k in ("n_mfcc", "n_fft", "hop_length", "n_mels")}
+    # 디스크에 한 번 만들어 둔 합성 데이터셋을 memmap으로 읽어 배치로 MFCC 추출
+    clips, labels, sr = load_corpus(n_pairs=config["n_pairs"], seed=config["seed"])
+    X_rf = extract_mfcc_batch(clips, sr, **feature_kwargs)
+
+    rf_model = RandomForestClassifier(n_estimators=config["n_estimators"], random_state=config["seed"])
+    with span("rf_fit"):
+        rf_model.fit(X_rf, labels)
+    return rf_model
+
+
+# 학습된 모델 가져오기
+# 1) 프로세스 메모리에 있으면 그대로 사용, 2) 디스크에 저장된 모델이 있으면 로드, 3) 없으면 학습 후 저장
+def get_rf_model(**overrides):
+    config = dict(DEFAULT_CONFIG, **overrides)
+    key = model_key(config)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(key)
+        if model is not None:
+            return model
+
+        path = os.path.join(MODEL_DIR, f"rf_{key}.joblib")
+        if os.path.exists(path):
+            try:
+                with span("rf_load"):
+                    model = joblib.load(path)
+            except Exception:
+                model = None  # 손상된 파일은 다시 학습
+
+        if model is None:
+            model = train_rf_model(config)
+            try:
+                os.makedirs(MODEL_DIR, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                joblib.dump(model, tmp_path)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass  # 읽기 전용 파일 시스템에서는 메모리에만 보관
+
+        _models[key] = model
+        return model
+
+
+# 랜덤 포레스트를 numpy 추론 형식(.npz)으로 내보내기 (이미 있으면 그대로 사용) -> 파일 경로
+# 추론 작업자(inference_pool, score_dir)는 이 파일을 compact_model.CompactForest로 불러오므로 sklearn이 필요 없습니다.
+def export_compact_rf(**overrides):
+    config = dict(DEFAULT_CONFIG, **overrides)
+    path = compact_rf_path(config)
+    if not os.path.exists(path):
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        export_forest(get_rf_model(**overrides), tmp_path)
+        os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,192 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+# 의견 저장소 (SQLite, WAL 모드) 경로와 예전 텍스트 파일 경로 (환경 변수로 변경 가능)
+DB_PATH = os.environ.get("ETHIC_OPINION_DB", "opinions.db")
+LEGACY_PATH = os.environ.get("ETHIC_OPINION_TXT", "data.txt")
+
+# 예전 data.txt에서 의견 사이의 구분선
+LEGACY_DELIMITER = "---"
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+# 스레드별 연결 (Streamlit은 세션마다 다른 스레드에서 스크립트를 실행합니다)
+def get_connection(db_path=None):
+    db_path = db_path or DB_PATH
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        connections[db_path] = conn
+        _ensure_schema(conn, db_path)
+    return conn
+
+
+# 테이블 생성과 data.txt 이전은 프로세스당 한 번만 수행
+def _ensure_schema(conn, db_path):
+    with _init_lock:
+        if db_path in _initialized:
+            return
+        _create_tables(conn)
+        if os.path.exists(LEGACY_PATH):
+            migrate_legacy_file(LEGACY_PATH, conn)
+        _initialized.add(db_path)
+
+
+def _create_tables(conn):
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS opinions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                text TEXT NOT NULL,
+                source TEXT,
+                created_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+
+# 예전 data.txt 내용을 의견 목록으로 나누기
+# run.py는 의견마다 '---' 줄을 붙였고, voice.py/12.py는 줄 단위로 저장했습니다.
+# 구분선이 하나라도 있으면 구분선 사이의 내용을, 없으면 비어 있지 않은 줄 하나를 한 개의 의견으로 봅니다.
+def parse_legacy_text(text):
+    lines = text.splitlines()
+    if not any(line.strip() == LEGACY_DELIMITER for line in lines):
+        return [line.strip() for line in lines if line.strip()]
+    opinions, current = [], []
+    for line in lines:
+        if line.strip() == LEGACY_DELIMITER:
+            entry = "\n".join(current).strip()
+            if entry:
+                opinions.append(entry)
+            current = []
+        else:
+            current.append(line)
+    entry = "\n".join(current).strip()
+    if entry:
+        opinions.append(entry)
+    return opinions
+
+
+# data.txt를 한 번만 DB로 옮김 (이미 옮긴 파일은 meta 테이블에 기록)
+def migrate_legacy_file(path, conn=None):
+    conn = conn or get_connection()
+    key = f"migrated:{os.path.abspath(path)}"
+    with conn:
+        # BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡아서 여러 프로세스가 동시에 옮기지 않도록 합니다.
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+            return 0
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            opinions = parse_legacy_text(f.read())
+        created_at = os.path.getmtime(path)
+        conn.executemany(
+            "INSERT INTO opinions (text, source, created_at) VALUES (?, ?, ?)",
+            [(text, "data.txt", created_at) for text in opinions],
+        )
+        conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(len(opinions))))
+    return len(opinions)
+
+
+# 의견 저장
+def add_opinion(text, source=None):
+    conn = get_connection()
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO opinions (text, source, created_at) VALUES (?, ?, ?)",
+            (text, source, time.time()),
+        )
+    return cur.lastrowid
+
+
+# 검색어/커서 조건 (LIKE 특수 문자는 그대로 검색되도록 이스케이프)
+def _where(query, before_id=None):
+    clauses, params = [], []
+    if query:
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append("text LIKE ? ESCAPE '\\'")
+        params.append(f"%{escaped}%")
+    if before_id is not None:
+        clauses.append("id < ?")
+        params.append(before_id)
+    if not clauses:
+        return "", ()
+    return " WHERE " + " AND ".join(clauses), tuple(params)
+
+
+# 저장된 의견 수 (query가 있으면 검색 결과 수)
+def count_opinions(query=None):
+    where, params = _where(query)
+    return get_connection().execute(f"SELECT COUNT(*) FROM opinions{where}", params).fetchone()[0]
+
+
+# 최근 의견부터 limit개 가져오기 (query가 있으면 검색 결과에서)
+# before_id를 주면 그보다 오래된 의견부터 가져오므로(키셋 페이지 이동) 뒤쪽 페이지도 앞쪽과 같은 속도로 읽습니다.
+# 각 항목: (id, text, source, created_at)
+def latest_opinions(limit=20, offset=0, query=None, before_id=None):
+    where, params = _where(query, before_id)
+    return get_connection().execute(
+        f"SELECT id, text, source, created_at FROM opinions{where} ORDER BY id DESC LIMIT ? OFFSET ?",
+        params + (limit, offset),
+    ).fetchall()
+
+
+# 예전 저장 방식(run.py: 구분선, voice.py/12.py: 줄 단위)으로 쓴 예시 파일 내용과 기대하는 의견 목록
+LEGACY_SAMPLES = {
+    "run.py": ("첫 번째 의견\n---\n여러 줄\n의견\n---\n", ["첫 번째 의견", "여러 줄\n의견"]),
+    "voice.py/12.py": ("첫 번째 의견\n\n두 번째 의견\n", ["첫 번째 의견", "두 번째 의견"]),
+}
+
+
+# data.txt 이전을 메모리 DB에서 시험 (실제 opinions.db는 바꾸지 않음) -> 문제 목록
+# 파일을 나눈 결과가 그대로 저장되는지, 두 번째 이전이 아무것도 추가하지 않는지 확인합니다.
+def check_migration(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        expected = parse_legacy_text(f.read())
+    conn = sqlite3.connect(":memory:")
+    _create_tables(conn)
+    problems = []
+    migrated = migrate_legacy_file(path, conn)
+    stored = [row[0] for row in conn.execute("SELECT text FROM opinions ORDER BY id")]
+    if migrated != len(expected) or stored != expected:
+        problems.append(f"{path}: 의견 {len(expected)}개 중 {migrated}개 이전, 저장된 내용이 다름")
+    if migrate_legacy_file(path, conn):
+        problems.append(f"{path}: 두 번째 이전에서 의견이 다시 추가됨")
+    conn.close()
+    print(f"{path}: 의견 {len(expected)}개 이전 확인")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="의견 저장소 관리")
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check-migration", help="data.txt 이전 결과 확인 (예전 저장 방식 예시도 함께 확인)")
+    check.add_argument("path", nargs="?", default=LEGACY_PATH)
+    args = parser.parse_args(argv)
+    if args.command == "check-migration":
+        problems = []
+        for writer, (text, opinions) in LEGACY_SAMPLES.items():
+            if parse_legacy_text(text) != opinions:
+                problems.append(f"{writer} 형식 예시를 잘못 나눔: {parse_legacy_text(text)!r}")
+        if os.path.exists(args.path):
+            problems += check_migration(args.path)
+        else:
+            print(f"{args.path} 파일이 없어서 예시만 확인했습니다.")
+        for problem in problems:
+            print(problem)
+        if problems:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
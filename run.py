@@ -1,4 +1,5 @@
 import streamlit as st
+import opinion_store
 url = 'https://www.youtube.com/watch?v=XyEOEBsa8I4'
 # 페이지 설정
 st.set_page_config(layout='wide', page_title='EthicApp')
@@ -25,17 +26,48 @@ st.sidebar.markdown("""
 - 참고 자료
 """)  # 기존 사이드바 유지
 
+# 학생 데이터 한 페이지에 보여줄 의견 수
+PAGE_SIZE = 20
+
+# 학생 데이터 보기 상태 초기화 (페이지마다 시작 커서를 저장해서 이전 페이지로 돌아갈 수 있게 함)
+def open_student_data():
+    st.session_state['show_student_data'] = True
+    st.session_state['student_cursors'] = [None]
+
+def close_student_data():
+    st.session_state['show_student_data'] = False
+
+def next_student_page(last_id):
+    st.session_state['student_cursors'].append(last_id)
+
+def prev_student_page():
+    if len(st.session_state['student_cursors']) > 1:
+        st.session_state['student_cursors'].pop()
+
 # "학생데이터 가져오기" 버튼 추가
-if st.sidebar.button("학생데이터(더블클릭)"):
-    # data.txt 파일에서 데이터 읽기
-    try:
-        with open("data.txt", "r", encoding="utf-8") as f:
-            student_data = f.read()  # 전체 파일 내용 읽기
-        # 콘텐츠 영역에 학생 데이터 표시
-        st.subheader("학생 데이터")
+st.sidebar.button("학생데이터(더블클릭)", on_click=open_student_data)
+
+if st.session_state.get('show_student_data'):
+    # 콘텐츠 영역에 학생 데이터 표시 (현재 페이지만 읽어서 전송)
+    st.subheader("학생 데이터")
+    query = st.text_input("검색어", key="student_query", on_change=open_student_data).strip()
+    cursors = st.session_state['student_cursors']
+    page_rows = opinion_store.latest_opinions(limit=PAGE_SIZE, query=query or None, before_id=cursors[-1])
+    total = opinion_store.count_opinions(query or None)
+
+    if page_rows:
+        student_data = "\n---\n".join(text for _, text, _, _ in page_rows)
         st.text_area("저장된 학생 데이터", student_data, height=300)
-    except FileNotFoundError:
-        st.error("data.txt 파일을 찾을 수 없습니다.")
+    else:
+        st.info("저장된 학생 데이터가 없습니다.")
+
+    n_pages = max(1, -(-total // PAGE_SIZE))
+    prev_col, info_col, next_col, close_col = st.columns([1, 2, 1, 1])
+    prev_col.button("◀ 이전", on_click=prev_student_page, disabled=len(cursors) == 1)
+    info_col.caption(f"{len(cursors)} / {n_pages} 페이지 (전체 {total}개)")
+    next_col.button("다음 ▶", on_click=next_student_page, args=(page_rows[-1][0] if page_rows else None,),
+                    disabled=len(page_rows) < PAGE_SIZE or len(cursors) >= n_pages)
+    close_col.button("닫기", on_click=close_student_data)
 
 # 내용 제시 영역 및 화면 분할
 content_col, tips_col = st.columns([4, 1])  # 컬럼 비율 (4,1)
@@ -60,8 +92,7 @@ with content_col:
     user_input = st.text_area("인공지능 윤리에 대한 의견 또는 질문을 작성해주세요:", height=100)
     if st.button("제출하기"):
         if user_input.strip():  # 빈 문자열은 저장하지 않음
-            with open("data.txt", "a", encoding="utf-8") as f:
-                f.write(user_input + "\n---\n")  # 구분선 포함하여 저장
+            opinion_store.add_opinion(user_input, source="run.py")  # 동시에 제출해도 안전한 SQLite 저장소
             st.success("의견이 성공적으로 저장되었습니다.")
         else:
             st.warning("내용을 입력해주세요.")
@@ -0,0 +1,152 @@
+# 폴더 안의 WAV 파일을 한꺼번에 판별하는 명령줄 도구
+# 사용법: python score_dir.py 폴더 -o results.jsonl --workers 4 [--resume]
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import soundfile as sf
+
+from audio_features import extract_mfcc
+from compact_model import CompactForest
+from ingest import MODEL_SR, load_audio
+from model_config import DEFAULT_CONFIG
+
+# 결과 파일의 열 순서
+FIELDS = ["path", "label", "prob_real", "duration", "sr", "bytes", "error"]
+
+# 작업 프로세스마다 한 번 불러오는 모델 (numpy만 사용하는 CompactForest)
+_rf_model = None
+
+
+# 작업 프로세스 시작 시 내보낸 모델 로드 (sklearn은 import 하지 않음)
+def _init_worker(model_path):
+    global _rf_model
+    _rf_model = CompactForest(model_path)
+
+
+# 파일 한 개 판별 (읽을 수 없는 파일도 예외 대신 error가 담긴 결과를 반환)
+def score_file(path):
+    result = {"path": path}
+    try:
+        result["bytes"] = os.path.getsize(path)
+        sr = sf.info(path).samplerate
+        # 모노, 모델 샘플레이트로 변환해서 읽기
+        audio, _ = load_audio(path)
+        mfcc = extract_mfcc(audio, MODEL_SR, n_mfcc=DEFAULT_CONFIG["n_mfcc"], n_fft=DEFAULT_CONFIG["n_fft"],
+                            hop_length=DEFAULT_CONFIG["hop_length"], n_mels=DEFAULT_CONFIG["n_mels"])
+        proba = _rf_model.predict_proba([mfcc])[0]
+        prob_real = float(proba[list(_rf_model.classes_).index(1)])
+        result.update(label="real" if prob_real >= 0.5 else "fake", prob_real=round(prob_real, 4),
+                      duration=round(len(audio) / MODEL_SR, 3), sr=sr)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+# 폴더 안의 WAV 파일 경로 (정렬된 순서)
+def find_wav_files(root):
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith(".wav"):
+                paths.append(os.path.join(dirpath, name))
+    return sorted(paths)
+
+
+# 이미 판별한 파일 목록 (중단된 작업을 이어서 할 때 결과 파일을 체크포인트로 사용)
+# 오류가 기록된 파일은 넣지 않으므로 이어서 실행하면 다시 판별합니다 (결과 파일에는 새 줄이 추가됨).
+def load_done(output, fmt):
+    if not os.path.exists(output):
+        return set()
+    done = set()
+    with open(output, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = []
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    pass  # 중단될 때 잘린 마지막 줄
+        for row in rows:
+            if row.get("path") and not row.get("error"):
+                done.add(row["path"])
+    return done
+
+
+# 결과를 한 줄씩 바로 기록 (중단되어도 기록된 결과는 남음)
+class ResultWriter:
+    def __init__(self, output, fmt, append):
+        self.fmt = fmt
+        write_header = not (append and os.path.exists(output) and os.path.getsize(output) > 0)
+        self._file = open(output, "a" if append else "w", encoding="utf-8", newline="")
+        if fmt == "csv":
+            self._writer = csv.DictWriter(self._file, fieldnames=FIELDS)
+            if write_header:
+                self._writer.writeheader()
+
+    def write(self, result):
+        if self.fmt == "csv":
+            self._writer.writerow({k: result.get(k, "") for k in FIELDS})
+        else:
+            self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="폴더 안의 WAV 파일을 진짜/가짜로 판별합니다.")
+    parser.add_argument("root", help="WAV 파일이 있는 폴더")
+    parser.add_argument("-o", "--output", default="scores.jsonl", help="결과 파일 (.csv 또는 .jsonl)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="결과 형식 (기본: 파일 확장자로 판단)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="작업 프로세스 수")
+    parser.add_argument("--resume", action="store_true", help="결과 파일에 이미 있는 파일은 건너뛰고 이어서 기록 (오류가 난 파일은 다시 판별)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    paths = find_wav_files(args.root)
+    done = load_done(args.output, fmt) if args.resume else set()
+    todo = [p for p in paths if p not in done]
+    print(f"{len(paths)}개 파일 중 {len(todo)}개 판별 (건너뜀 {len(paths) - len(todo)}개)", file=sys.stderr)
+
+    # 작업 프로세스들이 불러올 numpy 형식 모델을 먼저 학습/내보내기
+    from model_registry import export_compact_rf
+    model_path = export_compact_rf()
+
+    writer = ResultWriter(args.output, fmt, append=args.resume)
+    n_files = n_bytes = n_errors = 0
+    start = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(model_path,))
+    try:
+        futures = [executor.submit(score_file, path) for path in todo]
+        for future in as_completed(futures):
+            result = future.result()
+            writer.write(result)
+            n_files += 1
+            n_bytes += result.get("bytes", 0)
+            n_errors += "error" in result
+            if n_files % 100 == 0:
+                elapsed = time.perf_counter() - start
+                print(f"{n_files}/{len(todo)}  {n_files / elapsed:.1f} files/s", file=sys.stderr)
+        executor.shutdown()
+    except KeyboardInterrupt:
+        # 남은 작업은 취소하고 실행 중인 작업을 기다리지 않음 (with 블록처럼 모든 작업이 끝날 때까지 기다리지 않도록)
+        executor.shutdown(wait=False, cancel_futures=True)
+        print("중단됨: --resume 옵션으로 이어서 실행할 수 있습니다.", file=sys.stderr)
+    finally:
+        writer.close()
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"{n_files}개 파일, 오류 {n_errors}개, {elapsed:.2f}초, "
+          f"{n_files / elapsed:.1f} files/s, {n_bytes / elapsed / 1e6:.2f} MB/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# 세션별 음성 데이터를 메모리 예산 안에서 보관하는 저장소
+# st.session_state에 음성 배열을 직접 넣으면 세션이 끝나도 해제되지 않으므로, 배열은 여기에 두고
+# 프로세스 전체 사용량이 예산을 넘으면 가장 오래 사용하지 않은 세션의 음성부터 정리합니다.
+# 보관 형식: float32(기본) 또는 int16(절반 크기, 16비트 양자화), 세션 한도를 넘는 긴 음성은 임시 memmap 파일로 내보냄
+import atexit
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+# 메모리 예산 (MB, 환경 변수로 변경 가능)
+# ETHIC_SESSION_BUDGET_MB: 모든 세션의 음성이 메모리에서 차지할 수 있는 최대 크기
+# ETHIC_SESSION_MAX_MB: 세션 하나가 메모리에 둘 수 있는 최대 크기 (넘는 음성은 memmap 파일로 보관)
+# ETHIC_SPILL_BUDGET_MB: memmap 파일 전체의 최대 크기
+BUDGET_MB = float(os.environ.get("ETHIC_SESSION_BUDGET_MB", "512"))
+SESSION_MAX_MB = float(os.environ.get("ETHIC_SESSION_MAX_MB", "32"))
+SPILL_BUDGET_MB = float(os.environ.get("ETHIC_SPILL_BUDGET_MB", "2048"))
+
+# 메모리 보관 형식 (float32 또는 int16)
+STORAGE = os.environ.get("ETHIC_SESSION_STORAGE", "float32")
+
+# memmap 파일을 저장하는 폴더
+SPILL_DIR = os.environ.get(
+    "ETHIC_SPILL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "spill"),
+)
+
+_MB = 1024 * 1024
+
+
+# 보관된 음성 한 개
+class _Payload:
+    __slots__ = ("data", "sr", "storage", "nbytes", "path", "last_used")
+
+    def __init__(self, data, sr, storage, path=None):
+        self.data = data
+        self.sr = sr
+        self.storage = storage
+        self.nbytes = data.nbytes
+        self.path = path
+        self.last_used = time.time()
+
+    # 메모리 사용량 (memmap은 디스크에 있으므로 0)
+    @property
+    def memory_bytes(self):
+        return 0 if self.storage == "memmap" else self.nbytes
+
+    @property
+    def disk_bytes(self):
+        return self.nbytes if self.storage == "memmap" else 0
+
+    # float32 음성으로 복원 (int16은 새 배열, 나머지는 읽기 전용 배열을 그대로 반환)
+    def audio(self):
+        if self.storage == "int16":
+            return self.data.astype(np.float32) * np.float32(1 / 32767)
+        return self.data
+
+    def release(self):
+        if self.path is not None:
+            self.data = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass  # Windows에서는 아직 매핑된 파일을 지울 수 없으므로 SPILL_DIR에 남겨 둠
+
+
+# 세션별 음성 저장소 (모든 세션이 공유하므로 잠금 사용)
+class SessionAudioStore:
+    def __init__(self, budget_bytes, session_bytes, spill_budget_bytes, storage=STORAGE, spill_dir=SPILL_DIR):
+        self.budget_bytes = budget_bytes
+        self.session_bytes = session_bytes
+        self.spill_budget_bytes = spill_budget_bytes
+        self.storage = storage
+        self.spill_dir = spill_dir
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.evictions = 0
+        self._sessions = OrderedDict()  # session_id -> {name: _Payload}, 가장 오래 사용하지 않은 세션이 앞
+        self._lock = threading.Lock()
+
+    # 음성 저장 (같은 이름의 이전 음성은 교체)
+    def put(self, session_id, name, audio, sr):
+        audio = np.asarray(audio)
+        with self._lock:
+            payloads = self._sessions.setdefault(session_id, {})
+            self._sessions.move_to_end(session_id)
+            self._remove(payloads, name)
+            session_memory = sum(p.memory_bytes for p in payloads.values())
+            payload = self._encode(audio, sr, session_memory)
+            payloads[name] = payload
+            self.memory_bytes += payload.memory_bytes
+            self.disk_bytes += payload.disk_bytes
+            self._evict(keep=session_id)
+            return payload
+
+    # 음성 가져오기 -> (audio, sr), 없거나 정리된 경우 (None, None)
+    def get(self, session_id, name):
+        with self._lock:
+            payloads = self._sessions.get(session_id)
+            payload = payloads.get(name) if payloads else None
+            if payload is None:
+                return None, None
+            self._sessions.move_to_end(session_id)
+            payload.last_used = time.time()
+        return payload.audio(), payload.sr
+
+    def discard(self, session_id, name=None):
+        with self._lock:
+            payloads = self._sessions.get(session_id)
+            if not payloads:
+                return
+            for key in [name] if name is not None else list(payloads):
+                self._remove(payloads, key)
+            if not payloads:
+                del self._sessions[session_id]
+
+    # 더 이상 연결되지 않은 세션의 음성 정리 (is_active(session_id)가 False인 세션)
+    def prune(self, is_active):
+        with self._lock:
+            for session_id in [s for s in self._sessions if not is_active(s)]:
+                self._drop_session(session_id)
+
+    def clear(self):
+        with self._lock:
+            for session_id in list(self._sessions):
+                self._drop_session(session_id)
+
+    # 전체 및 세션별 사용량
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            sessions = [
+                {
+                    "session": session_id,
+                    "items": len(payloads),
+                    "memory_bytes": sum(p.memory_bytes for p in payloads.values()),
+                    "disk_bytes": sum(p.disk_bytes for p in payloads.values()),
+                    "storage": ",".join(sorted({p.storage for p in payloads.values()})),
+                    "idle_seconds": now - max((p.last_used for p in payloads.values()), default=now),
+                }
+                for session_id, payloads in reversed(self._sessions.items())
+            ]
+            return {
+                "sessions": sessions,
+                "memory_bytes": self.memory_bytes,
+                "budget_bytes": self.budget_bytes,
+                "disk_bytes": self.disk_bytes,
+                "spill_budget_bytes": self.spill_budget_bytes,
+                "evictions": self.evictions,
+            }
+
+    # 보관 형식으로 변환 (세션 한도를 넘으면 memmap 파일로 내보냄)
+    def _encode(self, audio, sr, session_memory):
+        storage = self.storage
+        if storage == "int16":
+            data = (np.clip(audio, -1.0, 1.0) * 32767).round().astype(np.int16)
+        else:
+            data = np.array(audio, dtype=np.float32)
+        if session_memory + data.nbytes <= self.session_bytes:
+            data.setflags(write=False)
+            return _Payload(data, sr, storage)
+
+        os.makedirs(self.spill_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix=f"audio_{os.getpid()}_", suffix=".npy", dir=self.spill_dir)
+        os.close(fd)
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=audio.shape)
+        out[:] = audio
+        out.flush()
+        del out
+        return _Payload(np.load(path, mmap_mode="r"), sr, "memmap", path)
+
+    def _remove(self, payloads, name):
+        payload = payloads.pop(name, None)
+        if payload is not None:
+            self.memory_bytes -= payload.memory_bytes
+            self.disk_bytes -= payload.disk_bytes
+            payload.release()
+
+    def _drop_session(self, session_id):
+        payloads = self._sessions.pop(session_id)
+        for name in list(payloads):
+            self._remove(payloads, name)
+
+    # 예산을 넘으면 가장 오래 사용하지 않은 세션부터 정리 (방금 저장한 세션은 정리하지 않음)
+    # 메모리 예산을 넘으면 메모리에 음성이 있는 세션만, 파일 예산을 넘으면 memmap 파일이 있는 세션만 대상으로 합니다.
+    def _evict(self, keep):
+        while True:
+            if self.memory_bytes > self.budget_bytes:
+                resource = "memory_bytes"
+            elif self.disk_bytes > self.spill_budget_bytes:
+                resource = "disk_bytes"
+            else:
+                break
+            victim = next((s for s, payloads in self._sessions.items()
+                           if s != keep and any(getattr(p, resource) for p in payloads.values())), None)
+            if victim is None:
+                break
+            self._drop_session(victim)
+            self.evictions += 1
+
+
+# 프로세스 전체에서 공유하는 저장소
+store = SessionAudioStore(BUDGET_MB * _MB, SESSION_MAX_MB * _MB, SPILL_BUDGET_MB * _MB)
+atexit.register(store.clear)
+
+
+# 현재 세션의 저장소 키 "<Streamlit 세션 ID>/<세션별 토큰>" (Streamlit 밖에서 실행하면 "local")
+# 토큰은 session_state에 두므로, 세션 ID가 모두 같은 AppTest(부하 테스트)에서도 세션마다 키가 다릅니다.
+def current_session_id():
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return "local"
+    token = st.session_state.get("_audio_store_token")
+    if token is None:
+        token = st.session_state["_audio_store_token"] = uuid.uuid4().hex[:8]
+    return f"{ctx.session_id}/{token}"
+
+
+# 연결이 끊긴 세션의 음성 정리 (Streamlit 서버에서 실행 중일 때만)
+def prune_inactive_sessions():
+    from streamlit import runtime
+    if runtime.exists():
+        is_active = runtime.get_instance().is_active_session
+        store.prune(lambda key: is_active(key.split("/", 1)[0]))
+
+
+# 현재 세션의 음성 저장 (저장할 때마다 끊긴 세션도 정리)
+def put_audio(audio, sr, name="audio"):
+    prune_inactive_sessions()
+    store.put(current_session_id(), name, audio, sr)
+
+
+# 현재 세션의 음성 -> (audio, sr), 없거나 메모리 예산 때문에 정리되었으면 (None, None)
+def get_audio(name="audio"):
+    return store.get(current_session_id(), name)
+
+
+def clear_audio(name="audio"):
+    store.discard(current_session_id(), name)
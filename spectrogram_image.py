@@ -0,0 +1,86 @@
+# 스펙트로그램을 matplotlib 그림 없이 바로 PNG/WebP 이미지로 만드는 모듈
+# 화면 해상도에 맞게 최댓값 풀링으로 줄인 뒤, 미리 만든 색상표(LUT)로 색을 입히고 Pillow로 인코딩합니다.
+import io
+import os
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+from instrumentation import timed
+
+# 표시 크기(픽셀)와 이미지 형식 (환경 변수로 변경 가능, 예: ETHIC_SPECTROGRAM_FORMAT=webp)
+DISPLAY_WIDTH = int(os.environ.get("ETHIC_SPECTROGRAM_WIDTH", "800"))
+DISPLAY_HEIGHT = int(os.environ.get("ETHIC_SPECTROGRAM_HEIGHT", "256"))
+IMAGE_FORMAT = os.environ.get("ETHIC_SPECTROGRAM_FORMAT", "png")
+
+# 색 범위: 최댓값에서 이 값(dB)보다 낮은 값은 같은 색으로 표시
+DYNAMIC_RANGE_DB = 80.0
+
+
+# matplotlib 색상표를 256단계 RGB 표 (256, 3) uint8로 변환 (색상표별로 한 번만)
+@lru_cache(maxsize=8)
+def colormap_lut(name="inferno"):
+    import matplotlib
+    lut = (matplotlib.colormaps[name](np.linspace(0, 1, 256))[:, :3] * 255).round().astype(np.uint8)
+    lut.setflags(write=False)
+    return lut
+
+
+# 한 축을 size 칸으로 최댓값 풀링 (원래 칸 수가 더 적으면 정수배로 반복해서 늘림)
+def _pool_axis(S, size, axis):
+    n = S.shape[axis]
+    if n > size:
+        edges = np.linspace(0, n, size + 1).astype(np.intp)[:-1]
+        return np.maximum.reduceat(S, edges, axis=axis)
+    if n and size // n > 1:
+        return np.repeat(S, size // n, axis=axis)
+    return S
+
+
+# (n_bins, n_frames) 배열을 (height, width) 이하 크기로 최댓값 풀링 (좁은 피크가 사라지지 않도록)
+def max_pool(S, height, width):
+    return _pool_axis(_pool_axis(S, height, 0), width, 1)
+
+
+# RGB 배열을 이미지 bytes로 인코딩
+def encode_image(rgb, fmt=IMAGE_FORMAT):
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        Image.fromarray(rgb).save(buffer, format="WEBP", lossless=True, method=0)
+    else:
+        Image.fromarray(rgb).save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+# 색 범위 (vmin, vmax): 전체 스펙트로그램 기준으로 구해서 확대 구간들도 같은 색으로 표시
+def color_range(S_dB):
+    vmax = float(np.max(S_dB))
+    return max(float(np.min(S_dB)), vmax - DYNAMIC_RANGE_DB), vmax
+
+
+# dB 스펙트로그램 (n_bins, n_frames) -> 이미지 bytes (낮은 주파수가 아래쪽)
+# frames=(start, end)를 주면 그 구간만 그립니다 (확대 보기).
+@timed("render_spectrogram")
+def render_spectrogram(S_dB, width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT, fmt=IMAGE_FORMAT, cmap="inferno",
+                       frames=None, vrange=None):
+    vmin, vmax = vrange if vrange is not None else color_range(S_dB)
+    if frames is not None:
+        S_dB = S_dB[:, frames[0]:frames[1]]
+    pooled = max_pool(np.asarray(S_dB, dtype=np.float32), height, width)
+    scale = 255.0 / max(vmax - vmin, 1e-6)
+    index = np.clip((pooled[::-1] - vmin) * scale, 0, 255).astype(np.uint8)
+    return encode_image(colormap_lut(cmap)[index], fmt)
+
+
+# 확대 보기용 구간 목록 [(start, end), ...] (tile_frames 프레임씩)
+def tile_ranges(n_frames, tile_frames):
+    tile_frames = max(1, int(tile_frames))
+    return [(start, min(start + tile_frames, n_frames)) for start in range(0, n_frames, tile_frames)]
+
+
+# index번째 구간만 자세히 그림 (색 범위는 전체 기준)
+def render_tile(S_dB, index, tile_frames, width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT, fmt=IMAGE_FORMAT,
+                cmap="inferno"):
+    frames = tile_ranges(S_dB.shape[1], tile_frames)[index]
+    return render_spectrogram(S_dB, width, height, fmt, cmap, frames=frames, vrange=color_range(S_dB))
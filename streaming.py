@@ -0,0 +1,265 @@
+import time
+from collections import deque
+
+import numpy as np
+import soundfile as sf
+
+from audio_features import AUDIO_DTYPE, power_spectrum
+from feature_ops import dct_matrix, delta_from_padded, mel_filter_bank, power_to_db
+from inference_pool import get_inference_pool
+from ingest import MODEL_SR, iter_audio
+from instrumentation import timed
+from model_config import DEFAULT_CONFIG
+
+# score_stream이 결과를 기다리지 않고 미리 작업자에게 보내 둘 수 있는 구간 수
+# 작업자가 앞 구간을 분류하는 동안 다음 구간의 특성을 추출하고, 밀린 구간들은 한 묶음으로 분류됩니다.
+MAX_PENDING_WINDOWS = 8
+
+
+# 블록 단위로 들어오는 음성에서 STFT 프레임을 이어서 계산하는 클래스
+# 프레임 간격과 창은 extract_mfcc(scipy.signal.spectrogram)와 같으며,
+# 블록 경계에 걸친 샘플은 다음 블록으로 넘겨서(carry-over) 프레임이 빠지거나 겹치지 않게 합니다.
+class StreamingLogMel:
+    def __init__(self, sr, n_fft=2048, hop_length=512, n_mels=40):
+        self.sr = sr
+        self.n_fft = n_fft
+        # spectrogram(noverlap=hop_length)의 프레임 간격
+        self.step = n_fft - hop_length
+        self.mel_filters = mel_filter_bank(sr, n_fft, n_mels)
+        self._carry = np.zeros(0, dtype=AUDIO_DTYPE)
+
+    # 새 블록을 넣고, 이번에 완성된 프레임들의 dB Mel 에너지 (n_frames, n_mels)를 반환
+    def push(self, block):
+        buf = np.concatenate([self._carry, block]) if len(self._carry) else np.asarray(block, dtype=AUDIO_DTYPE)
+        if len(buf) < self.n_fft:
+            self._carry = buf
+            return np.empty((0, self.mel_filters.shape[0]))
+
+        frames = np.lib.stride_tricks.sliding_window_view(buf, self.n_fft)[::self.step]
+        # 다음 프레임의 시작 위치부터는 다음 블록과 이어서 계산
+        self._carry = buf[len(frames) * self.step:].copy()
+        psd = power_spectrum(frames, self.sr, self.n_fft)
+        return power_to_db(psd @ self.mel_filters.T)
+
+
+# 긴 음성 파일을 블록 단위로 읽어 구간(window_seconds)별 진짜 확률을 순서대로 내보내는 제너레이터
+# 메모리 사용량은 파일 길이가 아니라 블록/구간 크기에 비례합니다.
+# 분류는 추론 작업자 풀(inference_pool)에서 하므로, 이 스레드는 특성 추출만 하고 결과를 기다립니다.
+# 각 결과: {"start": 초, "end": 초, "prob_real": 0~1}
+def score_stream(file, window_seconds=3, chunk_seconds=3, pool=None):
+    config = DEFAULT_CONFIG
+    if pool is None:
+        pool = get_inference_pool()
+    dct_basis = dct_matrix(config["n_mfcc"], config["n_mels"])
+
+    # 모노, 모델 샘플레이트로 변환된 블록을 차례로 받음 (ingest)
+    sr = MODEL_SR
+    analyzer = StreamingLogMel(sr, n_fft=config["n_fft"], hop_length=config["hop_length"],
+                               n_mels=config["n_mels"])
+    # 구간 하나에 들어가는 프레임 수 (extract_mfcc가 같은 길이의 클립에서 만드는 프레임 수와 동일)
+    frames_per_window = max(1, (int(sr * window_seconds) - analyzer.n_fft) // analyzer.step + 1)
+    window_sum = np.zeros(config["n_mels"])
+    window_count = 0
+    frame_index = 0
+    pending = deque()  # 작업자에게 보낸 구간 (순서대로)
+
+    for block in iter_audio(file, sr, chunk_seconds=chunk_seconds):
+        mel_log = analyzer.push(block)
+        for row in mel_log:
+            window_sum += row
+            window_count += 1
+            frame_index += 1
+            if window_count == frames_per_window:
+                pending.append(_submit_window(pool, dct_basis, window_sum, window_count, frame_index, analyzer, sr))
+                window_sum[:] = 0
+                window_count = 0
+                if len(pending) >= MAX_PENDING_WINDOWS:
+                    yield _window_result(*pending.popleft())
+        # 이미 분류가 끝난 구간은 바로 내보냄
+        while pending and pending[0][0].done():
+            yield _window_result(*pending.popleft())
+
+    # 마지막 남은 프레임도 하나의 구간으로 평가
+    if window_count:
+        pending.append(_submit_window(pool, dct_basis, window_sum, window_count, frame_index, analyzer, sr))
+    while pending:
+        yield _window_result(*pending.popleft())
+
+
+# 구간의 평균 dB Mel 에너지로 MFCC를 만들어 분류 요청 -> (Future, 시작 초, 끝 초)
+def _submit_window(pool, dct_basis, window_sum, window_count, frame_index, analyzer, sr):
+    mfcc = dct_basis @ (window_sum / window_count)
+    start = (frame_index - window_count) * analyzer.step / sr
+    end = ((frame_index - 1) * analyzer.step + analyzer.n_fft) / sr
+    return pool.submit_features(mfcc), start, end
+
+
+def _window_result(future, start, end):
+    return {"start": start, "end": end, "prob_real": future.result()}
+
+
+# 프레임 특성의 개수, 평균, 분산을 새 프레임이 들어올 때마다 갱신하는 클래스
+# 프레임을 저장하지 않고 블록 단위로 합치므로 (Chan 등의 병합 공식) 메모리는 특성 차원에만 비례합니다.
+class RunningStats:
+    def __init__(self, n_features):
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self._m2 = np.zeros(n_features)  # 평균과의 차이 제곱합
+
+    # 프레임 묶음 (n_frames, n_features) 반영
+    def update(self, frames):
+        n = len(frames)
+        if not n:
+            return
+        batch_mean = frames.mean(axis=0)
+        batch_m2 = ((frames - batch_mean) ** 2).sum(axis=0)
+        total = self.count + n
+        diff = batch_mean - self.mean
+        self.mean = self.mean + diff * (n / total)
+        self._m2 = self._m2 + batch_m2 + diff ** 2 * (self.count * n / total)
+        self.count = total
+
+    @property
+    def var(self):
+        return self._m2 / self.count if self.count else np.zeros_like(self._m2)
+
+
+# 블록 단위로 들어오는 프레임 특성의 delta를 이어서 계산하는 클래스
+# 뒤쪽 half개 프레임이 들어와야 delta가 정해지므로 출력은 half 프레임만큼 늦고, flush()에서 나머지를 내보냅니다.
+# 결과를 이어 붙이면 전체 프레임에 한 번에 delta_coefficients를 적용한 결과와 같습니다.
+class DeltaStream:
+    def __init__(self, width=9):
+        self.half = width // 2
+        self._buf = None  # 왼쪽 문맥 half개 + 아직 내보내지 않은 프레임
+        self._pending = 0
+
+    # 새 프레임 (n, d)를 넣고, delta가 정해진 프레임들과 그 delta를 반환 -> (frames, deltas)
+    def push(self, frames):
+        if len(frames):
+            if self._buf is None:
+                # 신호 시작: 첫 프레임을 반복해서 왼쪽 문맥으로 사용
+                self._buf = np.concatenate([np.repeat(frames[:1], self.half, axis=0), frames])
+            else:
+                self._buf = np.concatenate([self._buf, frames])
+            self._pending += len(frames)
+        return self._emit(self._pending - self.half)
+
+    # 남은 프레임의 delta 계산 (신호의 끝, 마지막 프레임을 반복해서 오른쪽 문맥으로 사용)
+    def flush(self):
+        if self._buf is not None and self._pending:
+            self._buf = np.concatenate([self._buf, np.repeat(self._buf[-1:], self.half, axis=0)])
+            self._pending += self.half
+        return self._emit(self._pending - self.half)
+
+    def _emit(self, ready):
+        if self._buf is None or ready <= 0:
+            return np.empty((0, 0)), np.empty((0, 0))
+        start = len(self._buf) - self._pending
+        window = self._buf[start - self.half:start + ready + self.half]
+        out = self._buf[start:start + ready], delta_from_padded(window, self.half)
+        self._buf = self._buf[start + ready - self.half:]
+        self._pending -= ready
+        return out
+
+
+# 블록 단위 음성 -> 프레임별 [MFCC, delta] (extract_mfcc_frames와 같은 값)와 누적 통계
+class StreamingMfccFrames:
+    def __init__(self, sr, n_mfcc=13, n_fft=2048, hop_length=512, n_mels=40, delta_width=9):
+        self.log_mel = StreamingLogMel(sr, n_fft=n_fft, hop_length=hop_length, n_mels=n_mels)
+        self.dct_basis = dct_matrix(n_mfcc, n_mels)
+        self.deltas = DeltaStream(delta_width)
+        self.stats = RunningStats(2 * n_mfcc)
+
+    # 새 블록을 넣고 이번에 완성된 프레임 특성 (n_frames, 2 * n_mfcc)를 반환
+    def push(self, block):
+        return self._update(*self.deltas.push(self.log_mel.push(block) @ self.dct_basis.T))
+
+    def flush(self):
+        return self._update(*self.deltas.flush())
+
+    def _update(self, mfcc, delta):
+        if not len(mfcc):
+            return np.empty((0, self.stats.mean.shape[0]))
+        frames = np.hstack([mfcc, delta])
+        self.stats.update(frames)
+        return frames
+
+
+# 앞부분만 보고도 확실하면 판별을 끝내는 분류기
+# 누적 평균 MFCC(extract_mfcc와 같은 특성)로 min_seconds부터 check_growth배씩 늘어나는 시점마다 진짜 확률을 계산하고,
+# patience번 연속으로 확률이 threshold 이상(또는 1 - threshold 이하)이면 나머지 음성을 읽지 않습니다.
+# 랜덤 포레스트 예측 한 번이 수 초 분량의 특성 추출보다 비싸므로 확인 간격을 점점 늘립니다.
+# 예측은 추론 작업자 풀(inference_pool)에서 합니다.
+class EarlyExitClassifier:
+    def __init__(self, pool=None, threshold=0.8, min_seconds=3, check_growth=2.0, patience=2,
+                 config=DEFAULT_CONFIG):
+        self.pool = pool if pool is not None else get_inference_pool()
+        self.threshold = threshold
+        self.min_seconds = min_seconds
+        self.check_growth = check_growth
+        self.patience = patience
+        self.config = config
+
+    # 누적 통계로 진짜 확률 계산 (평균 MFCC 부분만 사용)
+    def prob_real(self, stats):
+        mean_mfcc = stats.mean[:self.config["n_mfcc"]]
+        return self.pool.submit_features(mean_mfcc).result()
+
+    # 모노, sr Hz 블록들을 분류 -> 결과 dict (total_seconds를 주면 절약한 계산량도 계산)
+    def classify_blocks(self, blocks, sr=MODEL_SR, total_seconds=None):
+        config = self.config
+        start_time = time.perf_counter()
+        analyzer = StreamingMfccFrames(sr, n_mfcc=config["n_mfcc"], n_fft=config["n_fft"],
+                                       hop_length=config["hop_length"], n_mels=config["n_mels"])
+        samples = 0
+        next_check = self.min_seconds
+        streak = 0
+        checks = []
+        prob = None
+        decided_early = False
+        for block in blocks:
+            analyzer.push(block)
+            samples += len(block)
+            if samples / sr < next_check or not analyzer.stats.count:
+                continue
+            next_check = samples / sr * self.check_growth
+            prob = self.prob_real(analyzer.stats)
+            checks.append((samples / sr, prob))
+            confident = max(prob, 1 - prob) >= self.threshold
+            streak = streak + 1 if confident else 0
+            if streak >= self.patience:
+                decided_early = True
+                break
+        if not decided_early:
+            analyzer.flush()
+            if analyzer.stats.count:
+                prob = self.prob_real(analyzer.stats)
+                checks.append((samples / sr, prob))
+
+        seconds_used = samples / sr
+        result = {
+            "label": None if prob is None else ("real" if prob >= 0.5 else "fake"),
+            "prob_real": prob,
+            "decided_early": decided_early,
+            "seconds_used": seconds_used,
+            "frames_used": analyzer.stats.count,
+            "elapsed": time.perf_counter() - start_time,
+            "checks": checks,
+        }
+        if total_seconds:
+            # 읽지 않은 음성 비율 = 절약한 계산량 (특성 추출 비용은 길이에 비례)
+            result["total_seconds"] = total_seconds
+            result["saved_fraction"] = max(0.0, 1 - seconds_used / total_seconds)
+        return result
+
+    # 음성 파일을 블록 단위로 읽으며 분류 (판단이 끝나면 나머지는 읽지 않음)
+    @timed("early_exit_classify")
+    def classify_file(self, file, chunk_seconds=0.5):
+        info = sf.info(file)
+        if hasattr(file, "seek"):
+            file.seek(0)
+        blocks = iter_audio(file, MODEL_SR, chunk_seconds=chunk_seconds)
+        try:
+            return self.classify_blocks(blocks, MODEL_SR, total_seconds=info.duration)
+        finally:
+            blocks.close()  # 중간에 멈춘 경우 파일을 바로 닫음
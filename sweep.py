@@ -0,0 +1,186 @@
+# 특성 추출 설정과 랜덤 포레스트 설정 조합을 교차 검증으로 비교하는 도구
+# 특성(MFCC)은 특성 설정마다 한 번만 추출해서 모든 모델 설정에 재사용하고, 폴드는 joblib으로 병렬 실행합니다.
+# 결과: 정확도와 클립당 추론 시간(특성 추출 + 예측)의 파레토 표
+# 사용법: python sweep.py --wav-dir 라벨폴더 --n-mfcc 13 20 --n-estimators 25 50 100 -o sweep.csv --jobs 4
+#   라벨 폴더: 경로에 real 또는 fake 폴더가 있는 WAV 파일 (예: 라벨폴더/real/a.wav, 라벨폴더/fake/b.wav)
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+import soundfile as sf
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+
+from audio_features import extract_mfcc, extract_mfcc_batch
+from corpus import DEFAULT_CORPUS, load_corpus
+from ingest import MODEL_SR, load_audio
+from model_registry import DEFAULT_CONFIG
+from score_dir import find_wav_files
+
+FEATURE_KEYS = ("n_mfcc", "n_fft", "hop_length", "n_mels")
+MODEL_KEYS = ("n_estimators", "max_depth")
+
+# 결과 파일의 열 순서
+FIELDS = list(FEATURE_KEYS + MODEL_KEYS) + ["accuracy", "accuracy_std", "feature_ms", "predict_ms", "total_ms",
+                                            "pareto"]
+
+# 추론 시간을 잴 때 사용할 클립 수 (한 클립씩 앱과 같은 방식으로 측정)
+TIMING_CLIPS = 20
+
+
+# 라벨 폴더의 WAV 파일 읽기 -> [(audio, label), ...] (경로에 real/fake 폴더가 없거나 읽을 수 없는 파일은 건너뜀)
+def load_labelled_wavs(root):
+    items = []
+    for path in find_wav_files(root):
+        parts = [p.lower() for p in os.path.relpath(path, root).split(os.sep)[:-1]]
+        label = 1 if "real" in parts else 0 if "fake" in parts else None
+        if label is None:
+            print(f"라벨 없음, 건너뜀: {path}", file=sys.stderr)
+            continue
+        try:
+            audio, _ = load_audio(path)
+        except (sf.LibsndfileError, RuntimeError) as e:
+            print(f"읽을 수 없음, 건너뜀: {path} ({type(e).__name__}: {e})", file=sys.stderr)
+            continue
+        items.append((audio, label))
+    return items
+
+
+# 특성 설정 하나로 전체 데이터의 MFCC 추출 (합성 데이터는 배치, WAV는 길이가 달라 한 개씩)
+def extract_features(clips, sr, wavs, feature_config):
+    X = extract_mfcc_batch(clips, sr, **feature_config)
+    if wavs:
+        X_wav = np.stack([extract_mfcc(audio, MODEL_SR, **feature_config) for audio, _ in wavs])
+        X = np.concatenate([X, X_wav.astype(X.dtype)])
+    return X
+
+
+# 클립 한 개의 특성 추출 시간(중앙값, 초) (앱처럼 extract_mfcc를 한 클립씩 호출)
+def feature_latency(clips, sr, feature_config):
+    times = []
+    for audio in clips[:TIMING_CLIPS]:
+        start = time.perf_counter()
+        extract_mfcc(audio, sr, **feature_config)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+# 클립 한 개의 예측 시간(중앙값, 초) (앱처럼 한 행씩 predict)
+def predict_latency(model, X):
+    times = []
+    for row in X[:TIMING_CLIPS]:
+        start = time.perf_counter()
+        model.predict(row[None, :])
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+# 폴드 하나 학습/평가 (작업 프로세스에서 실행) -> (정확도, 첫 폴드면 학습된 모델)
+def _fit_fold(X, y, train, test, model_config, seed, keep_model):
+    model = RandomForestClassifier(n_estimators=model_config["n_estimators"], max_depth=model_config["max_depth"],
+                                   random_state=seed, n_jobs=1)
+    model.fit(X[train], y[train])
+    accuracy = float((model.predict(X[test]) == y[test]).mean())
+    return accuracy, model if keep_model else None
+
+
+# 정확도가 높고 시간이 짧은 쪽이 좋은 파레토 최적 여부 표시
+def mark_pareto(rows):
+    for row in rows:
+        row["pareto"] = not any(
+            other["accuracy"] >= row["accuracy"] and other["total_ms"] <= row["total_ms"]
+            and (other["accuracy"] > row["accuracy"] or other["total_ms"] < row["total_ms"])
+            for other in rows
+        )
+    return rows
+
+
+# 설정 그리드 전체 평가 -> 결과 행 목록
+def run_sweep(feature_grid, model_grid, clips, labels, sr, wavs=(), folds=5, jobs=-1, seed=42):
+    y = np.concatenate([labels, np.array([label for _, label in wavs], dtype=labels.dtype)])
+    splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(np.zeros(len(y)), y))
+    rows = []
+    with Parallel(n_jobs=jobs) as parallel:
+        for feature_config in feature_grid:
+            start = time.perf_counter()
+            X = extract_features(clips, sr, wavs, feature_config)
+            feature_s = feature_latency(clips, sr, feature_config)
+            print(f"특성 {feature_config}: {len(y)}개 클립 {time.perf_counter() - start:.1f}초", file=sys.stderr)
+
+            # 모든 모델 설정 x 폴드를 한 번에 병렬 실행
+            tasks = [(model_config, i) for model_config in model_grid for i in range(len(splits))]
+            results = parallel(
+                delayed(_fit_fold)(X, y, splits[i][0], splits[i][1], model_config, seed, i == 0)
+                for model_config, i in tasks
+            )
+            for j, model_config in enumerate(model_grid):
+                fold_results = results[j * len(splits):(j + 1) * len(splits)]
+                accuracies = [accuracy for accuracy, _ in fold_results]
+                predict_s = predict_latency(fold_results[0][1], X)
+                rows.append(dict(
+                    feature_config, **model_config,
+                    accuracy=round(float(np.mean(accuracies)), 4),
+                    accuracy_std=round(float(np.std(accuracies)), 4),
+                    feature_ms=round(feature_s * 1000, 3),
+                    predict_ms=round(predict_s * 1000, 3),
+                    total_ms=round((feature_s + predict_s) * 1000, 3),
+                ))
+    return mark_pareto(rows)
+
+
+# 파레토 표 출력 (파레토 최적 설정만, 시간 순)
+def print_table(rows, file=sys.stdout):
+    header = ["n_mfcc", "n_fft", "hop", "n_mels", "trees", "depth", "정확도", "특성(ms)", "예측(ms)", "합계(ms)"]
+    print(" ".join(f"{h:>9}" for h in header), file=file)
+    for row in sorted((r for r in rows if r["pareto"]), key=lambda r: r["total_ms"]):
+        values = [row[k] for k in FEATURE_KEYS + MODEL_KEYS]
+        values[-1] = "-" if values[-1] is None else values[-1]
+        print(" ".join(f"{v:>9}" for v in values)
+              + f" {row['accuracy']:>9.3f} {row['feature_ms']:>9.2f} {row['predict_ms']:>9.2f} {row['total_ms']:>9.2f}",
+              file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="특성/모델 설정 조합을 교차 검증으로 비교합니다.")
+    parser.add_argument("--wav-dir", help="real/fake 폴더로 라벨이 붙은 WAV 폴더 (합성 데이터에 추가)")
+    parser.add_argument("--n-pairs", type=int, default=DEFAULT_CONFIG["n_pairs"], help="합성 진짜/가짜 쌍 수")
+    parser.add_argument("--noise-level", type=float, default=DEFAULT_CORPUS["noise_level"], help="합성 음성 잡음 크기")
+    parser.add_argument("--n-mfcc", type=int, nargs="+", default=[13, 20])
+    parser.add_argument("--n-fft", type=int, nargs="+", default=[1024, 2048])
+    parser.add_argument("--hop-length", type=int, nargs="+", default=[256, 512])
+    parser.add_argument("--n-mels", type=int, nargs="+", default=[40, 64])
+    parser.add_argument("--n-estimators", type=int, nargs="+", default=[25, 50, 100, 200])
+    parser.add_argument("--max-depth", type=int, nargs="+", default=[0], help="트리 최대 깊이 (0: 제한 없음)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=-1, help="병렬 작업 수 (-1: 모든 코어)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_CONFIG["seed"])
+    parser.add_argument("-o", "--output", help="전체 결과 CSV 파일")
+    args = parser.parse_args(argv)
+
+    feature_grid = [dict(zip(FEATURE_KEYS, values)) for values in
+                    itertools.product(args.n_mfcc, args.n_fft, args.hop_length, args.n_mels)
+                    if values[2] < values[1]]  # hop_length(겹침)는 n_fft보다 작아야 함
+    model_grid = [{"n_estimators": n, "max_depth": d or None}
+                  for n, d in itertools.product(args.n_estimators, args.max_depth)]
+
+    clips, labels, sr = load_corpus(n_pairs=args.n_pairs, seed=args.seed, noise_level=args.noise_level)
+    wavs = load_labelled_wavs(args.wav_dir) if args.wav_dir else []
+    print(f"합성 클립 {len(labels)}개, WAV {len(wavs)}개, 특성 설정 {len(feature_grid)}개 x 모델 설정 "
+          f"{len(model_grid)}개 x {args.folds}폴드", file=sys.stderr)
+
+    rows = run_sweep(feature_grid, model_grid, clips, labels, sr, wavs, args.folds, args.jobs, args.seed)
+    print_table(rows)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
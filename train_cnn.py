@@ -0,0 +1,151 @@
+# 스펙트로그램 CNN을 tf.data 파이프라인으로 학습하고 가중치를 저장하는 도구
+# 앱(12.py)은 학습하지 않고 저장된 모델을 numpy 추론기로 불러와 사용합니다 (predict_cnn).
+# tensorflow가 필요합니다 (선택 패키지: pip install -r requirements-train.txt).
+# 사용법: python train_cnn.py --epochs 5 --batch-size 32 [--mixed-precision]
+import argparse
+import os
+import time
+
+import numpy as np
+
+from audio_features import extract_mel_image
+from compact_model import CompactCNN, check_cnn_export, export_cnn
+from corpus import load_corpus
+from model_config import MODEL_DIR
+
+# 학습된 CNN 파일 (Keras 전체 모델, numpy 추론용)
+CNN_KERAS_PATH = os.path.join(MODEL_DIR, "cnn.keras")
+CNN_COMPACT_PATH = os.path.join(MODEL_DIR, "cnn_compact.npz")
+
+_pretrained = None
+
+
+# 간단한 CNN 모델 구성 (app.py/12.py의 build_cnn_model과 같은 구조)
+def build_cnn_model(input_shape=(128, 128, 1)):
+    from tensorflow.keras import layers, models
+    model = models.Sequential([
+        layers.Input(shape=input_shape),
+        layers.Conv2D(32, (3, 3), activation='relu'),
+        layers.MaxPooling2D((2, 2)),
+        layers.Conv2D(64, (3, 3), activation='relu'),
+        layers.MaxPooling2D((2, 2)),
+        layers.Flatten(),
+        layers.Dense(64, activation='relu'),
+        # mixed precision에서도 출력은 float32로 유지
+        layers.Dense(1, activation='sigmoid', dtype='float32')
+    ])
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+    return model
+
+
+# 음성 -> CNN 입력 이미지 (학습과 추론에서 같은 전처리)
+# audio는 (n_samples,) 또는 (n_clips, n_samples), 결과는 0~1 범위로 맞추고 채널 축을 붙인 (..., 128, 128, 1) float32
+def cnn_input(audio, sr):
+    images = extract_mel_image(audio, sr)
+    return (images / 80.0 + 1.0)[..., None].astype(np.float32)
+
+
+# 인덱스 배치로 memmap에서 클립을 읽어 스펙트로그램 이미지 배치를 만드는 함수
+# numpy FFT/행렬곱은 GIL을 풀기 때문에 tf.data의 병렬 map 스레드들이 여러 코어를 사용합니다.
+def _make_batch_fn(clips, labels, sr):
+    def load_batch(indices):
+        indices = np.sort(indices)  # memmap을 순서대로 읽도록 정렬
+        return cnn_input(clips[indices], sr), labels[indices].astype(np.float32)
+    return load_batch
+
+
+# 합성 데이터셋에서 tf.data 파이프라인 생성 (셔플 -> 배치 -> 병렬 특성 추출 -> prefetch)
+def make_dataset(clips, labels, sr, indices, batch_size, shuffle=True, seed=42):
+    import tensorflow as tf
+    load_batch = _make_batch_fn(clips, labels, sr)
+
+    def tf_load(batch_indices):
+        images, y = tf.numpy_function(load_batch, [batch_indices], (tf.float32, tf.float32))
+        images.set_shape([None, 128, 128, 1])
+        y.set_shape([None])
+        return images, y
+
+    ds = tf.data.Dataset.from_tensor_slices(indices)
+    if shuffle:
+        ds = ds.shuffle(len(indices), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size)
+    ds = ds.map(tf_load, num_parallel_calls=tf.data.AUTOTUNE, deterministic=False)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+# 에포크마다 초당 처리한 예제 수 출력
+def _throughput_callback(n_examples):
+    import tensorflow as tf
+
+    class ExamplesPerSecond(tf.keras.callbacks.Callback):
+        def on_epoch_begin(self, epoch, logs=None):
+            self._start = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            elapsed = time.perf_counter() - self._start
+            print(f"epoch {epoch + 1}: {n_examples / elapsed:.1f} examples/s ({elapsed:.1f}s)")
+
+    return ExamplesPerSecond()
+
+
+# 학습 실행: 가중치 체크포인트와 numpy 추론용 파일을 저장
+def train(epochs=5, batch_size=32, n_pairs=500, val_fraction=0.2, mixed_precision=False, seed=42):
+    import tensorflow as tf
+    if mixed_precision:
+        tf.keras.mixed_precision.set_global_policy("mixed_float16")
+
+    clips, labels, sr = load_corpus(n_pairs=n_pairs, seed=seed)
+    order = np.random.default_rng(seed).permutation(len(labels))
+    n_val = int(len(order) * val_fraction)
+    train_idx, val_idx = order[n_val:], order[:n_val]
+
+    train_ds = make_dataset(clips, labels, sr, train_idx, batch_size, shuffle=True, seed=seed)
+    val_ds = make_dataset(clips, labels, sr, val_idx, batch_size, shuffle=False)
+
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    model = build_cnn_model()
+    callbacks = [
+        tf.keras.callbacks.ModelCheckpoint(CNN_KERAS_PATH, monitor="val_accuracy", save_best_only=True),
+        _throughput_callback(len(train_idx)),
+    ]
+    model.fit(train_ds, validation_data=val_ds, epochs=epochs, callbacks=callbacks)
+
+    # 가장 좋은 체크포인트를 numpy 추론 형식으로도 저장 (앱에서는 tensorflow 없이 사용)
+    # 저장한 파일이 Keras와 같은 값을 내는지 확인 (mixed precision은 float16으로 계산하므로 허용 오차를 넓힘)
+    best = tf.keras.models.load_model(CNN_KERAS_PATH)
+    export_cnn(best, CNN_COMPACT_PATH)
+    check_cnn_export(best, CompactCNN(CNN_COMPACT_PATH), tolerance=1e-2 if mixed_precision else 1e-4)
+    return best
+
+
+# 앱에서 사용할 미리 학습된 CNN (numpy 추론기, 없으면 None)
+def load_pretrained_cnn():
+    global _pretrained
+    if _pretrained is None and os.path.exists(CNN_COMPACT_PATH):
+        _pretrained = CompactCNN(CNN_COMPACT_PATH)
+    return _pretrained
+
+
+# 미리 학습된 CNN으로 음성 한 개의 진짜 확률 계산 (학습된 모델 파일이 없으면 None)
+def predict_cnn(audio, sr):
+    model = load_pretrained_cnn()
+    if model is None:
+        return None
+    return float(model.predict(cnn_input(audio, sr)[None])[0, 0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스펙트로그램 CNN 학습 (tf.data 파이프라인)")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--n-pairs", type=int, default=500, help="진짜/가짜 합성 클립 쌍의 수")
+    parser.add_argument("--val-fraction", type=float, default=0.2)
+    parser.add_argument("--mixed-precision", action="store_true", help="mixed_float16 정책 사용")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    train(epochs=args.epochs, batch_size=args.batch_size, n_pairs=args.n_pairs,
+          val_fraction=args.val_fraction, mixed_precision=args.mixed_precision, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,23 @@
 import streamlit as st
-import os
-import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.ensemble import RandomForestClassifier
 # import tensorflow as tf # 불필요한 tensorflow import 제거
 # from tensorflow.keras import layers, models # 불필요한 tensorflow import 제거
-import io
-import soundfile as sf
-import base64
-from scipy.fft import fft
-from scipy.signal import spectrogram
+import time
+from lazy_imports import lazy_module
+import opinion_store
+import instrumentation
+import admin_panel
+
+# 무거운 모듈은 '딥페이크 음성' 페이지에서 처음 사용할 때 불러옵니다 (다른 페이지의 시작 시간 단축)
+np = lazy_module("numpy")
+sf = lazy_module("soundfile")
+audio_features = lazy_module("audio_features")
+audio_player = lazy_module("audio_player")
+streaming = lazy_module("streaming")
+ingest = lazy_module("ingest")
+feature_cache = lazy_module("feature_cache")
+spectrogram_image = lazy_module("spectrogram_image")
+inference_pool = lazy_module("inference_pool")
+session_store = lazy_module("session_store")
 
 # 페이지 설정
 st.set_page_config(layout='wide', page_title='EthicApp')
@@ -20,53 +28,56 @@ menu = st.sidebar.radio("Menu", ["홈", "AI 윤리 개요", "딥페이크 음성
 # YouTube 영상 링크
 url = 'https://www.youtube.com/watch?v=XyEOEBsa8I4'
 
-# 합성 오디오 생성 함수
-def generate_synthetic_audio(is_real=True, duration=3, sr=22050):
-    t = np.linspace(0, duration, int(sr * duration))
-    if is_real:
-        # 자연스러운 주파수를 가진 진짜 음성 모사
-        freq = 200 + 100 * np.sin(2 * np.pi * 0.1 * t)
-        audio = 0.5 * np.sin(2 * np.pi * freq * t)
-    else:
-        # 인위적 패턴과 노이즈를 더한 딥페이크 음성 모사
-        freq = 200 + 50 * np.sin(2 * np.pi * 0.2 * t)
-        audio = 0.5 * np.sin(2 * np.pi * freq * t) + 0.1 * np.random.randn(len(t))
-    return audio, sr
+# 이보다 긴 업로드 파일은 메모리에 전부 올리지 않고 구간별로 분석 (초)
+MAX_IN_MEMORY_SECONDS = 60
 
-# MFCC 특성 추출 함수 (scipy + numpy 사용)
-def extract_mfcc(audio, sr, n_mfcc=13, n_fft=2048, hop_length=512, n_mels=40):
-    # 음성에서 퓨리에 변환 수행
-    freqs, times, Sxx = spectrogram(audio, fs=sr, nperseg=n_fft, noverlap=hop_length)
-    
-    # Mel 필터 뱅크 생성 (MFCC에서 사용하는 Mel 축을 변환)
-    mel_filters = np.zeros((n_mels, len(freqs)))
-    mel_freqs = np.linspace(0, sr / 2, n_mels + 2)
-    for i in range(1, len(mel_freqs) - 1):
-        start = int(np.floor(mel_freqs[i - 1] / (sr / 2) * len(freqs)))
-        end = int(np.floor(mel_freqs[i] / (sr / 2) * len(freqs)))
-        mel_filters[i - 1, start:end] = np.linspace(0, 1, end - start)
-    
-    # Mel 스펙트로그램 계산
-    mel_spectrogram = np.dot(mel_filters, np.abs(Sxx))
-    mel_log = np.log(mel_spectrogram + 1e-9)
-    
-    # MFCC 계산 (DCT 사용)
-    mfcc = np.fft.dct(mel_log, type=2, axis=0)[:n_mfcc]
-    return np.mean(mfcc.T, axis=0)
+# 이보다 긴 음성은 스펙트로그램을 ZOOM_SECONDS초 구간으로 나눠 확대해 볼 수 있음 (초)
+ZOOM_SECONDS = 5
 
-# 스펙트로그램 이미지 추출 함수
-def extract_spectrogram(audio, sr, n_mels=128, hop_length=512):
-    _, _, Sxx = spectrogram(audio, fs=sr, nperseg=2048, noverlap=hop_length)
-    S_dB = 10 * np.log10(Sxx + 1e-9) # log10(0) 방지
-    return S_dB
+# 스펙트로그램 이미지를 화면 크기로 그려 캐시에서 가져오는 함수 (같은 음성이면 세션 간 공유)
+def spectrogram_png(audio, sr, tile=None, tile_frames=None):
+    S_dB = lambda: feature_cache.cached_spectrogram(audio, sr)
+    if tile is None:
+        render = lambda: spectrogram_image.render_spectrogram(S_dB())
+    else:
+        render = lambda: spectrogram_image.render_tile(S_dB(), tile, tile_frames)
+    return feature_cache.cached_figure('spectrogram', audio, sr, render,
+                                       width=spectrogram_image.DISPLAY_WIDTH,
+                                       height=spectrogram_image.DISPLAY_HEIGHT,
+                                       fmt=spectrogram_image.IMAGE_FORMAT,
+                                       tile=tile, tile_frames=tile_frames)
 
-# 오디오 재생 플레이어 생성 함수
-def get_audio_player(audio, sr):
-    buffer = io.BytesIO()
-    sf.write(buffer, audio, sr, format='WAV')
-    audio_base64 = base64.b64encode(buffer.getvalue()).decode()
-    audio_html = f'<audio controls><source src="data:audio/wav;base64,{audio_base64}" type="audio/wav"></audio>'
-    return audio_html
+# 긴 음성 파일의 구간별 분석 결과를 계산되는 대로 보여주는 함수
+def show_stream_scores(uploaded_file, total_seconds):
+    progress = st.progress(0.0)
+    chart = st.empty()
+    scores = []
+    for result in streaming.score_stream(uploaded_file):
+        scores.append(result['prob_real'])
+        progress.progress(min(result['end'] / total_seconds, 1.0))
+        if len(scores) % 10 == 1:
+            chart.line_chart(scores)
+    progress.progress(1.0)
+    chart.line_chart(scores)
+    if scores:
+        real_ratio = np.mean(np.array(scores) >= 0.5)
+        st.write(f"**구간별 AI 예측:** 전체 {len(scores)}개 구간 중 {real_ratio * 100:.0f}%가 진짜 음성으로 판단되었습니다.")
+
+# 긴 음성 파일을 앞부분부터 읽다가 AI가 확신하면 멈추고 결과와 절약한 계산량을 보여주는 함수
+def show_early_exit_result(uploaded_file):
+    with st.spinner("앞부분부터 분석 중..."):
+        result = streaming.EarlyExitClassifier().classify_file(uploaded_file)
+    if result['label'] is None:
+        st.warning("분석할 수 있는 음성이 없습니다.")
+        return
+    label = "진짜 음성" if result['label'] == 'real' else "딥페이크 음성"
+    st.write(f"**AI 예측:** {label} (진짜일 확률 {result['prob_real'] * 100:.0f}%)")
+    if result['decided_early']:
+        st.write(f"전체 {result['total_seconds']:.0f}초 중 처음 {result['seconds_used']:.1f}초만 분석하고 판단했습니다 "
+                 f"(계산량 {result['saved_fraction'] * 100:.0f}% 절약, {result['elapsed']:.2f}초 소요).")
+    else:
+        st.write(f"앞부분만으로는 확신할 수 없어 전체 {result['seconds_used']:.0f}초를 분석했습니다 "
+                 f"({result['elapsed']:.2f}초 소요).")
 
 # 간단한 CNN 모델 구성 (현재 사용되지 않으므로 주석 처리 또는 삭제 가능)
 # def build_cnn_model(input_shape=(128, 128, 1)):
@@ -108,76 +119,107 @@ def run_deepfake_detection():
 
     with col1:
         if st.button("진짜 음성 생성"):
-            audio, sr = generate_synthetic_audio(is_real=True)
-            st.session_state['audio'] = audio
+            audio, sr = audio_features.generate_synthetic_audio(is_real=True)
+            session_store.put_audio(audio, sr)
             st.session_state['sr'] = sr
             st.session_state['is_real'] = True
             st.markdown("**✔️ 진짜 음성 샘플 생성됨**")
-            st.markdown(get_audio_player(audio, sr), unsafe_allow_html=True)
+            audio_player.show_audio_player(audio, sr)
 
     with col2:
         if st.button("가짜 음성 생성"):
-            audio, sr = generate_synthetic_audio(is_real=False)
-            st.session_state['audio'] = audio
+            audio, sr = audio_features.generate_synthetic_audio(is_real=False)
+            session_store.put_audio(audio, sr)
             st.session_state['sr'] = sr
             st.session_state['is_real'] = False
             st.markdown("**✔️ 가짜 음성 샘플 생성됨**")
-            st.markdown(get_audio_player(audio, sr), unsafe_allow_html=True)
+            audio_player.show_audio_player(audio, sr)
 
     uploaded_file = st.file_uploader("또는 WAV 파일 업로드", type=["wav"])
     if uploaded_file:
         try:
-            audio, sr = sf.read(uploaded_file)
-            st.session_state['audio'] = audio
-            st.session_state['sr'] = sr
-            st.session_state['is_real'] = None
-            st.markdown("**✔️ 업로드된 음성**")
-            st.markdown(get_audio_player(audio, sr), unsafe_allow_html=True)
+            with sf.SoundFile(uploaded_file) as f:
+                upload_seconds = f.frames / f.samplerate
+            uploaded_file.seek(0)
+            if upload_seconds > MAX_IN_MEMORY_SECONDS:
+                # 긴 파일은 전체를 읽지 않고 블록 단위로 분석
+                session_store.clear_audio()
+                st.session_state.pop('sr', None)
+                st.markdown(f"**✔️ 업로드된 음성** (길이 {upload_seconds:.0f}초, 구간별로 분석합니다)")
+                if st.button("빠른 판별 실행"):
+                    show_early_exit_result(uploaded_file)
+                if st.button("구간별 분석 실행"):
+                    show_stream_scores(uploaded_file, upload_seconds)
+            else:
+                # 모노, 모델 샘플레이트(22050 Hz)로 변환해서 읽기
+                audio, sr = ingest.load_audio(uploaded_file)
+                session_store.put_audio(audio, sr)
+                st.session_state['sr'] = sr
+                st.session_state['is_real'] = None
+                st.markdown("**✔️ 업로드된 음성**")
+                audio_player.show_audio_player(audio, sr)
         except Exception as e:
             st.error(f"파일을 로드하는 데 실패했습니다: {e}")
 
+    # 음성 배열은 세션 저장소에 있음 (메모리 예산을 넘으면 오래 사용하지 않은 세션부터 정리됨)
+    audio, sr = session_store.get_audio()
+    if audio is None and 'sr' in st.session_state:
+        st.info("메모리를 아끼기 위해 오래 사용하지 않은 음성을 정리했습니다. 음성을 다시 생성하거나 업로드해주세요.")
+        del st.session_state['sr']
+
     # 2단계: 스펙트로그램 시각화
-    if 'audio' in st.session_state:
+    if audio is not None:
         st.subheader("2단계: 스펙트로그램 확인")
-        fig, ax = plt.subplots()
-        S_dB = extract_spectrogram(st.session_state['audio'], st.session_state['sr'])
-        ax.imshow(S_dB, aspect='auto', cmap='inferno', origin='lower')
-        ax.set(title='Mel 스펙트로그램')
-        st.pyplot(fig)
+        try:
+            st.image(spectrogram_png(audio, sr), caption="Mel 스펙트로그램 (가로: 시간, 세로: 주파수, 아래쪽이 낮은 소리)",
+                     width='stretch')
+            # 긴 음성은 고른 구간만 자세히 그림
+            duration = len(audio) / sr
+            if duration > 2 * ZOOM_SECONDS:
+                n_frames = feature_cache.cached_spectrogram(audio, sr).shape[1]
+                tile_frames = max(1, round(n_frames * ZOOM_SECONDS / duration))
+                n_tiles = len(spectrogram_image.tile_ranges(n_frames, tile_frames))
+                tile = st.select_slider("확대해서 볼 구간", options=range(n_tiles),
+                                        format_func=lambda i: f"{i * ZOOM_SECONDS}~{min((i + 1) * ZOOM_SECONDS, duration):.0f}초")
+                st.image(spectrogram_png(audio, sr, tile, tile_frames), width='stretch')
+        except Exception as e:
+            st.error(f"스펙트로그램을 그리는 데 실패했습니다: {e}")
 
     # 3단계: AI 학습 및 분류
     st.subheader("3단계: AI로 분류하기")
     if st.button("학습 후 분류 실행"):
-        if 'audio' not in st.session_state:
+        if audio is None:
             st.warning("먼저 음성을 생성하거나 업로드해주세요.")
             return
 
-        # 랜덤 포레스트용 데이터 생성
-        X_rf, y_rf = [], []
-        for _ in range(50):
-            ra, sr = generate_synthetic_audio(is_real=True)
-            fa, _ = generate_synthetic_audio(is_real=False)
-            X_rf.append(extract_mfcc(ra, sr))
-            X_rf.append(extract_mfcc(fa, sr))
-            y_rf.append(1)
-            y_rf.append(0)
-
-        X_rf = np.array(X_rf)
-        y_rf = np.array(y_rf)
-
-        # 랜덤 포레스트 모델 훈련
-        rf_model = RandomForestClassifier(n_estimators=100, random_state=42) # 재현성을 위해 random_state 추가
-        rf_model.fit(X_rf, y_rf)
-
         # 음성 데이터 처리
-        mfcc = extract_mfcc(st.session_state['audio'], st.session_state['sr'])
-        pred_rf = rf_model.predict([mfcc])
+        mfcc = feature_cache.cached_mfcc(audio, sr)
 
-        st.write(f"**AI 예측 결과:** {'진짜' if pred_rf[0] == 1 else '가짜'} 음성")
+        # 분류는 별도 작업자 프로세스에서 실행하고, 결과가 나올 때까지 진행 상태 표시
+        with st.spinner("AI 모델 준비 중..."):
+            pool = inference_pool.get_inference_pool()
+        # rf_predict: 요청을 넣은 뒤 결과를 받을 때까지 (작업자 대기 시간 포함)
+        with instrumentation.span("rf_predict"):
+            future = pool.submit_features(mfcc)
+            progress = st.progress(0.0, text="AI가 분류하는 중...")
+            start = time.perf_counter()
+            while not future.done():
+                time.sleep(0.05)
+                elapsed = time.perf_counter() - start
+                progress.progress(min(elapsed / 2.0, 0.95), text=f"AI가 분류하는 중... (대기 중인 요청 {pool.pending()}개)")
+            progress.empty()
+        try:
+            prob_real = future.result()
+        except Exception as e:
+            st.error(f"분류하는 데 실패했습니다. 다시 시도해주세요: {e}")
+            return
+        pred_rf = 1 if prob_real >= 0.5 else 0
+
+        st.write(f"**AI 예측 결과:** {'진짜' if pred_rf == 1 else '가짜'} 음성")
         if st.session_state['is_real'] is not None:
             st.write(f"**실제 음성 여부:** {'진짜' if st.session_state['is_real'] else '가짜'} 음성")
-            if (pred_rf[0] == 1 and st.session_state['is_real']) or \
-               (pred_rf[0] == 0 and not st.session_state['is_real']):
+            if (pred_rf == 1 and st.session_state['is_real']) or \
+               (pred_rf == 0 and not st.session_state['is_real']):
                 st.success("🎉 AI가 정확하게 예측했습니다!")
             else:
                 st.error("🤔 AI가 잘못 예측했습니다. 더 많은 데이터와 복잡한 모델이 필요할 수 있습니다.")
@@ -202,8 +244,7 @@ if menu == "홈":
         user_opinion = st.text_area("의견을 입력하세요:")
         if st.button("의견 제출"):
             if user_opinion:
-                with open("data.txt", "a", encoding='utf-8') as file: # 한글 인코딩 추가
-                    file.write(f"{user_opinion}\n")
+                opinion_store.add_opinion(user_opinion, source="voice.py")
                 st.success("의견이 성공적으로 제출되었습니다.")
             else:
                 st.warning("의견을 입력해주세요.")
@@ -260,4 +301,9 @@ elif menu == "참고 자료":
     * **Scikit-learn 공식 문서**: [https://scikit-learn.org/stable/documentation.html](https://scikit-learn.org/stable/documentation.html)
     * **Streamlit 공식 문서**: [https://docs.streamlit.io/](https://docs.streamlit.io/)
     """)
-    
\ No newline at end of file
+
+# 관리자 패널 (ETHIC_ADMIN=1일 때만 표시, 이번 실행에서 계측한 단계까지 포함하도록 마지막에 그림)
+instrumentation.start_http_server()
+admin_panel.show_metrics_panel()
+admin_panel.show_inference_panel()
+admin_panel.show_memory_panel()